@@ -1,16 +1,46 @@
 """Build script to convert SQLite database to JSON for Vercel deployment."""
 
 import argparse
-import json
+import contextlib
+import shutil
 import sqlite3
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from chess_llm_eval.data.json_repo import JSONRepository
 from chess_llm_eval.schemas import AnalyticsResponse
 from website.server.analytics import build_analytics_response
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        # Encode to a single string first so each value costs one write() call
+        # instead of one per token as with json.dump.
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+# Number of rows fetched and encoded per round-trip when exporting a table
+FETCH_BATCH_SIZE = 10_000
+
+# The build only reads: memory-map pages instead of read()-ing them, allow a 64 MiB
+# page cache and keep temp B-trees for the analytics sorts in RAM.
+READ_PRAGMAS = """
+    PRAGMA query_only = 1;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -65536;
+    PRAGMA temp_store = MEMORY;
+"""
+
 
 def convert_sqlite_to_json(
     db_path: str = "data/storage.db",
@@ -30,30 +60,40 @@ def convert_sqlite_to_json(
 
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    ensure_analytics_indexes(conn)
+    conn.executescript(READ_PRAGMAS)
 
-    # Export each table
+    # Stream each table row-by-row so the whole database is never materialized
+    # in memory at once. Tables are independent, so each is exported on its own
+    # read-only connection into a temp file while analytics run on this one.
     tables = ["puzzle", "agent", "game", "move", "benchmark"]
-    data: dict[str, Any] = {}
-
-    for table in tables:
-        print(f"  Exporting {table}...")
-        cursor = conn.execute(f"SELECT * FROM {table}")
-        rows = cursor.fetchall()
 
-        # Convert rows to dicts
-        columns = [description[0] for description in cursor.description]
-        data[table] = [dict(zip(columns, row, strict=False)) for row in rows]
+    with contextlib.ExitStack() as stack, ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        table_files = [stack.enter_context(tempfile.TemporaryFile()) for _ in tables]
+        exports = [
+            executor.submit(_export_table, db_path, table, table_file)
+            for table, table_file in zip(tables, table_files, strict=True)
+        ]
 
-        print(f"    - {len(data[table])} rows exported")
+        # Also export pre-computed analytics for better performance
+        print("  Computing analytics...")
+        analytics = compute_analytics(conn)
 
-    # Also export pre-computed analytics for better performance
-    print("  Computing analytics...")
-    data["analytics"] = compute_analytics(conn)
+        print(f"  Writing to {output_path}...")
+        with open(output_path, "wb") as f:
+            f.write(b"{")
+            for table, table_file, export in zip(tables, table_files, exports, strict=True):
+                print(f"  Exporting {table}...")
+                row_count = export.result()
+                f.write(f'"{table}":'.encode())
+                table_file.seek(0)
+                shutil.copyfileobj(table_file, f)
+                f.write(b",")
+                print(f"    - {row_count} rows exported")
 
-    # Write to JSON
-    print(f"  Writing to {output_path}...")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+            f.write(b'"analytics":')
+            f.write(_dumps(analytics))
+            f.write(b"}")
 
     # Verify file was created
     output_file = Path(output_path)
@@ -70,6 +110,47 @@ def convert_sqlite_to_json(
         validate_json_output(output_path)
 
 
+def _export_table(db_path: str, table: str, f: BinaryIO) -> int:
+    """Write a table to ``f`` using a dedicated read-only connection.
+
+    Returns:
+        The number of rows written.
+    """
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    conn.executescript(READ_PRAGMAS)
+    try:
+        return _write_table(conn, table, f)
+    finally:
+        conn.close()
+
+
+def _write_table(conn: sqlite3.Connection, table: str, f: BinaryIO) -> int:
+    """Write a table as a JSON array of row objects, one row at a time.
+
+    Returns:
+        The number of rows written.
+    """
+    # Plain tuples are cheaper to fetch than sqlite3.Row; the column names are
+    # captured once from the cursor description instead.
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(f"SELECT * FROM {table}")
+    columns = tuple(description[0] for description in cursor.description)
+
+    # Fetch and encode in bounded batches: one write per batch keeps syscalls
+    # low while peak memory stays proportional to the batch, not the table.
+    cursor.arraysize = FETCH_BATCH_SIZE
+    row_count = 0
+    f.write(b"[")
+    while batch := cursor.fetchmany():
+        if row_count:
+            f.write(b",")
+        f.write(b",".join(_dumps(dict(zip(columns, row, strict=False))) for row in batch))
+        row_count += len(batch)
+    f.write(b"]")
+    return row_count
+
+
 def validate_json_output(output_path: str) -> None:
     """Validate generated JSON against API schemas."""
     print("  Validating JSON output against schemas...")
@@ -79,6 +160,19 @@ def validate_json_output(output_path: str) -> None:
     print("  Schema validation passed.")
 
 
+def ensure_analytics_indexes(conn: sqlite3.Connection) -> None:
+    """Create the join indexes the analytics queries rely on, if missing.
+
+    The names match SQLiteRepository's schema, so this is a no-op on databases it
+    created. benchmark(game_id) is already covered by its UNIQUE constraint.
+    """
+    conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_game_agent_name ON game(agent_name);
+        CREATE INDEX IF NOT EXISTS idx_game_puzzle_id ON game(puzzle_id);
+        CREATE INDEX IF NOT EXISTS idx_move_game_id ON move(game_id);
+    """)
+
+
 def compute_analytics(conn: sqlite3.Connection) -> dict[str, Any]:
     """Pre-compute expensive analytics queries at build time."""
     analytics = {}
@@ -128,29 +222,35 @@ def compute_analytics(conn: sqlite3.Connection) -> dict[str, Any]:
     """)
     analytics["puzzle_outcomes"] = [dict(row) for row in cursor.fetchall()]
 
-    # Illegal moves count per agent
+    # Illegal moves and token usage per agent share one pass over game JOIN move
     cursor = conn.execute("""
         SELECT
             g.agent_name,
             SUM(CASE WHEN m.illegal_move = 1 THEN 1 ELSE 0 END) as illegal_moves_count,
-            COUNT(m.id) as total_moves
-        FROM game g
-        JOIN move m ON g.id = m.game_id
-        GROUP BY g.agent_name
-    """)
-    analytics["illegal_moves"] = [dict(row) for row in cursor.fetchall()]
-
-    # Token usage stats
-    cursor = conn.execute("""
-        SELECT
-            g.agent_name,
+            COUNT(m.id) as total_moves,
             AVG(m.prompt_tokens) as avg_puzzle_prompt_tokens,
             AVG(m.completion_tokens) as avg_puzzle_completion_tokens
         FROM game g
         JOIN move m ON g.id = m.game_id
         GROUP BY g.agent_name
     """)
-    analytics["token_usage"] = [dict(row) for row in cursor.fetchall()]
+    move_stats = cursor.fetchall()
+    analytics["illegal_moves"] = [
+        {
+            "agent_name": row["agent_name"],
+            "illegal_moves_count": row["illegal_moves_count"],
+            "total_moves": row["total_moves"],
+        }
+        for row in move_stats
+    ]
+    analytics["token_usage"] = [
+        {
+            "agent_name": row["agent_name"],
+            "avg_puzzle_prompt_tokens": row["avg_puzzle_prompt_tokens"],
+            "avg_puzzle_completion_tokens": row["avg_puzzle_completion_tokens"],
+        }
+        for row in move_stats
+    ]
 
     return analytics
 
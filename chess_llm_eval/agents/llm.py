@@ -8,6 +8,12 @@ from chess_llm_eval.providers.base import LLMProvider
 
 logger = logging.getLogger(__name__)
 
+_FINAL_MOVE_RE = re.compile(r"<FinalMove>(.*?)</FinalMove>", re.DOTALL | re.IGNORECASE)
+# Punctuation and spaces LLMs tend to put inside a SAN move (e.g. "1. e4")
+_STRIP_TABLE = str.maketrans("", "", ". ")
+# Retry conversations kept between attempts; the oldest are dropped past this many
+_MAX_RETRY_HISTORIES = 64
+
 
 class LLMAgent(Agent):
     """Agent that uses an LLM via the LLMProvider interface."""
@@ -17,6 +23,8 @@ class LLMAgent(Agent):
     ) -> None:
         super().__init__(model_name, is_reasoning=is_reasoning, **kwargs)
         self.provider = provider
+        # Conversation sent by the last retry, keyed by (fen, failed moves) of that call
+        self._retry_histories: dict[tuple[Fen, tuple[SanMove, ...]], list[dict[str, str]]] = {}
 
     def _create_messages(
         self, fen: Fen, legal_moves: list[SanMove], color: Color
@@ -39,7 +47,7 @@ class LLMAgent(Agent):
 
     def _parse_move(self, content: str) -> SanMove | None:
         # Try to find <FinalMove> tag
-        match = re.search(r"<FinalMove>(.*?)</FinalMove>", content, re.DOTALL | re.IGNORECASE)
+        match = _FINAL_MOVE_RE.search(content)
         if match:
             return match.group(1).strip()
 
@@ -68,7 +76,7 @@ class LLMAgent(Agent):
                 return None
 
             # Clean move string (remove punctuation etc)
-            move = move.replace(".", "").replace(" ", "").strip()
+            move = move.translate(_STRIP_TABLE).strip()
 
             return move, pt, ct
 
@@ -76,25 +84,50 @@ class LLMAgent(Agent):
             logger.error(f"Error getting move from LLM: {e}")
             return None
 
-    async def retry_move(
+    def _retry_messages(
         self, failed_moves: list[SanMove], fen: Fen, legal_moves: list[SanMove], color: Color
-    ) -> tuple[SanMove, int, int] | None:
-        messages = self._create_messages(fen, legal_moves, color)
-
-        # Append history of failures
-        # Note: most providers are stateless per request, so we build full history
-        for bad_move in failed_moves:
+    ) -> list[dict[str, str]]:
+        # Most providers are stateless per request, so every retry sends the full history.
+        # The evaluator retries a position with one more failure each time, so the
+        # previous call's conversation only needs the newest failure appended. A position
+        # and its failures fully determine the conversation, so concurrent puzzles can't
+        # pick up each other's history.
+        prior = self._retry_histories.pop((fen, tuple(failed_moves[:-1])), None)
+        if prior is None:
+            messages = self._create_messages(fen, legal_moves, color)
+            new_failures = failed_moves
+        else:
+            messages = list(prior)
+            new_failures = failed_moves[-1:]
+
+        legal_moves_str = ", ".join(legal_moves)
+        for bad_move in new_failures:
             messages.append({"role": "assistant", "content": f"<FinalMove>{bad_move}</FinalMove>"})
             messages.append(
                 {
                     "role": "user",
                     "content": (
                         f"The move {bad_move} is illegal or invalid. "
-                        f"Please choose a legal move from the list: {', '.join(legal_moves)}. "
+                        f"Please choose a legal move from the list: {legal_moves_str}. "
                         "Wrap it in <FinalMove> tags."
                     ),
                 }
             )
+        return messages
+
+    def _keep_retry_history(
+        self, failed_moves: list[SanMove], fen: Fen, messages: list[dict[str, str]]
+    ) -> None:
+        """Keep a retry conversation for the next attempt on the same position."""
+        self._retry_histories[(fen, tuple(failed_moves))] = messages
+        if len(self._retry_histories) > _MAX_RETRY_HISTORIES:
+            # Positions whose retries ran out are never continued
+            del self._retry_histories[next(iter(self._retry_histories))]
+
+    async def retry_move(
+        self, failed_moves: list[SanMove], fen: Fen, legal_moves: list[SanMove], color: Color
+    ) -> tuple[SanMove, int, int] | None:
+        messages = self._retry_messages(failed_moves, fen, legal_moves, color)
 
         try:
             content, pt, ct = await self.provider.complete(
@@ -107,7 +140,10 @@ class LLMAgent(Agent):
             if not move:
                 return None
 
-            move = move.replace(".", "").replace(" ", "").strip()
+            move = move.translate(_STRIP_TABLE).strip()
+            # Only an illegal answer is retried again; a legal one ends the conversation
+            if move not in legal_moves:
+                self._keep_retry_history(failed_moves, fen, messages)
             return move, pt, ct
 
         except Exception as e:
@@ -25,7 +25,8 @@ class RandomAgent(Agent):
     async def retry_move(
         self, failed_moves: list[SanMove], fen: Fen, legal_moves: list[SanMove], color: Color
     ) -> tuple[SanMove, int, int] | None:
-        valid = [m for m in legal_moves if m not in failed_moves]
+        failed = frozenset(failed_moves)
+        valid = [m for m in legal_moves if m not in failed]
         if not valid:
             return None
         return random.choice(valid), 0, 0
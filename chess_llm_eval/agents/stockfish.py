@@ -1,7 +1,10 @@
+import asyncio
 import contextlib
 import logging
 import os
-from typing import Any
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
 
 import chess
 import chess.engine
@@ -11,6 +14,8 @@ from chess_llm_eval.core.types import Color, Fen, SanMove
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 class StockfishAgent(Agent):
     """Agent using Stockfish engine."""
@@ -29,6 +34,11 @@ class StockfishAgent(Agent):
 
         self.engine = chess.engine.SimpleEngine.popen_uci(stockfish_path)
         self.engine.configure({"Skill Level": self.level})
+        # SimpleEngine cancels the in-flight command when another one arrives, so engine
+        # calls from concurrently evaluated puzzles must take turns. The lock is held in
+        # the worker thread, so a cancelled caller can't release it while its command
+        # is still running.
+        self._engine_lock = threading.Lock()
         logger.info(f"Initialized Stockfish level {level}")
 
     async def get_move(
@@ -38,7 +48,10 @@ class StockfishAgent(Agent):
         try:
             # Time limit 0.1s is fast but maybe too fast for high levels?
             # For level 1 it's fine.
-            result = self.engine.play(board, chess.engine.Limit(time=0.1))
+            # SimpleEngine blocks, so run it in a worker thread to keep the event loop free
+            result = await asyncio.to_thread(
+                self._locked, self.engine.play, board, chess.engine.Limit(time=0.1)
+            )
             if result.move:
                 return board.san(result.move), 0, 0
             return None
@@ -56,22 +69,31 @@ class StockfishAgent(Agent):
         # Stockfish shouldn't generate illegal moves.
         # But if it does (or if we are testing robustness), try MultiPV.
         board = chess.Board(fen)
+        failed = frozenset(failed_moves)
         try:
-            analysis = self.engine.analyse(
-                board, chess.engine.Limit(time=0.1), multipv=len(failed_moves) + 1
+            multipv = len(failed_moves) + 1
+            analysis = await asyncio.to_thread(
+                self._locked,
+                lambda: self.engine.analyse(board, chess.engine.Limit(time=0.1), multipv=multipv),
             )
             for info in analysis:
                 if "pv" in info:
                     move = info["pv"][0]
                     san = board.san(move)
-                    if san not in failed_moves:
+                    if san not in failed:
                         return san, 0, 0
             return None
         except Exception:
             return None
 
+    def _locked(self, command: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """Run one engine command while holding the engine lock."""
+        with self._engine_lock:
+            return command(*args, **kwargs)
+
     def close(self) -> None:
-        self.engine.quit()
+        with self._engine_lock:
+            self.engine.quit()
 
     def __del__(self) -> None:
         with contextlib.suppress(Exception):
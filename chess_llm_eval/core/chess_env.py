@@ -18,11 +18,21 @@ class ChessEnv:
             logger.error(f"Invalid FEN string: {fen}")
             raise ValueError(f"Invalid FEN string: {fen}") from e
 
+        # SAN rendering of every legal move is expensive, so it is computed once
+        # per position and invalidated whenever a move is applied.
+        self._legal_moves: list[SanMove] | None = None
+        self._legal_moves_set: frozenset[SanMove] = frozenset()
+
     def get_legal_moves(self) -> list[SanMove]:
         """Returns the list of legal moves in SAN notation."""
-        legal_moves = [self.board.san(move) for move in self.board.legal_moves]
-        logger.debug(f"Legal moves: {legal_moves}")
-        return legal_moves
+        return list(self._cached_legal_moves())
+
+    def _cached_legal_moves(self) -> list[SanMove]:
+        if self._legal_moves is None:
+            self._legal_moves = [self.board.san(move) for move in self.board.legal_moves]
+            self._legal_moves_set = frozenset(self._legal_moves)
+            logger.debug(f"Legal moves: {self._legal_moves}")
+        return self._legal_moves
 
     def get_turn_color(self) -> Color:
         """Returns the color of the side to move."""
@@ -32,16 +42,21 @@ class ChessEnv:
 
     def is_move_legal(self, move_san: SanMove) -> bool:
         """Checks if a given move (in SAN) is legal in the current board state."""
-        try:
-            # python-chess 'parse_san' validates semantics (ambiguity, legality)
-            # strictly speaking 'san' generation is one way, 'parse_san' is the check
-            # But checking against get_legal_moves string list is robust for LLM output matching
-            is_legal = move_san in self.get_legal_moves()
-            if not is_legal:
-                logger.debug(f"Move {move_san} is not legal")
-            return is_legal
-        except ValueError:
-            return False
+        if self._legal_moves is not None:
+            is_legal = move_san in self._legal_moves_set
+        else:
+            # Parse the single candidate instead of rendering SAN for every legal
+            # move. Rendering it back keeps exact string matching for LLM output,
+            # so lenient forms parse_san accepts (e.g. "Ng1f3") are still rejected.
+            try:
+                move = self.board.parse_san(move_san)
+                is_legal = bool(move) and self.board.san(move) == move_san
+            except ValueError:
+                is_legal = False
+
+        if not is_legal:
+            logger.debug(f"Move {move_san} is not legal")
+        return is_legal
 
     def apply_move(self, move_san: SanMove) -> Fen:
         """
@@ -50,6 +65,7 @@ class ChessEnv:
         """
         try:
             self.board.push_san(move_san)
+            self._legal_moves = None
             new_fen = self.board.fen()
             logger.debug(f"Applied move {move_san}, new FEN: {new_fen}")
             return new_fen
@@ -57,6 +73,21 @@ class ChessEnv:
             logger.error(f"Error applying move {move_san}: {e}")
             raise ValueError(f"Illegal or invalid move: {move_san}") from e
 
+    def push_move(self, move: chess.Move) -> Fen:
+        """
+        Applies an already-parsed move to the board and returns the new FEN string.
+        Raises ValueError if the move is illegal in the current position.
+        """
+        if not self.board.is_legal(move):
+            logger.error(f"Error applying move {move.uci()}: illegal in {self.board.fen()}")
+            raise ValueError(f"Illegal or invalid move: {move.uci()}")
+
+        self.board.push(move)
+        self._legal_moves = None
+        new_fen = self.board.fen()
+        logger.debug(f"Applied move {move.uci()}, new FEN: {new_fen}")
+        return new_fen
+
     def uci_to_san(self, uci: UciMove) -> SanMove:
         """Convert UCI move to SAN move."""
         try:
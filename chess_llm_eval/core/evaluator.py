@@ -2,6 +2,8 @@ import asyncio
 import logging
 from dataclasses import dataclass
 
+import chess
+
 from chess_llm_eval.agents.base import Agent
 from chess_llm_eval.core.chess_env import ChessEnv
 from chess_llm_eval.core.types import SanMove
@@ -72,73 +74,108 @@ class Evaluator:
         chess_env = ChessEnv(puzzle.fen)
         failed_puzzle = False
         solution = puzzle.moves.split(" ")
+        # Parse the UCI solution once; each ply then only renders SAN for its own move
+        try:
+            solution_moves = [chess.Move.from_uci(uci) for uci in solution]
+        except ValueError as e:
+            self.logger.error(f"Invalid solution moves for puzzle {puzzle.id}: {e}")
+            return None
 
-        # Iterate through solution moves in pairs (opponent, model)
-        for i in range(0, len(solution), 2):
-            # 1. Opponent's move
-            try:
-                opponent_move_uci = solution[i]
-                opponent_move_san = chess_env.uci_to_san(opponent_move_uci)
-                fen_before = chess_env.board.fen()
-                chess_env.apply_move(opponent_move_san)
-                # fen_after = chess_env.board.fen() # Unused
-
-                # Save opponent move
-                self.repository.save_move(
-                    game_id,
-                    MoveRecord(
-                        fen=fen_before,
-                        expected_move=opponent_move_san,
-                        actual_move=opponent_move_san,
-                        is_illegal=False,
-                        game_id=game_id,
-                    ),
-                )
-            except Exception as e:
-                self.logger.error(f"Error processing opponent move {solution[i]}: {e}")
-                return None
-
-            # 2. Model's move
-            try:
-                expected_move_uci = solution[i + 1]
-                expected_move_san = chess_env.uci_to_san(expected_move_uci)
-            except IndexError:
-                # Puzzle might end on opponent move (unlikely for tactic puzzles but possible)
-                break
-
-            color = chess_env.get_turn_color()
-            legal_moves = chess_env.get_legal_moves()
-            fen_for_model = chess_env.board.fen()
-
-            self.logger.debug(f"Expected model move: {expected_move_san}")
-
-            # Get move from agent
-            result = await self.agent.get_move(fen_for_model, legal_moves, color)
-
-            if not result:
-                self.logger.error("Agent failed to generate move")
-                failed_puzzle = True
-                break
-
-            move_san, pt, ct = result
-            self.logger.info(f"Model move: {move_san}")
-
-            # Handle illegal moves
-            illegal_attempts: list[SanMove] = []
-            final_move_san = move_san
-
-            if not chess_env.is_move_legal(move_san):
-                failed_puzzle = (
-                    True  # Initially assume failure unless corrected (but actually retry logic)
-                )
-                # Wait, original logic retried 5 times. If strictly illegal, we retry.
+        # Buffer the game's moves and persist them in one transaction at the end
+        moves: list[MoveRecord] = []
+        finished = False
+        try:
+            # Iterate through solution moves in pairs (opponent, model)
+            for i in range(0, len(solution), 2):
+                # 1. Opponent's move
+                try:
+                    opponent_move = solution_moves[i]
+                    opponent_move_san = chess_env.board.san(opponent_move)
+                    fen_before = chess_env.board.fen()
+                    chess_env.push_move(opponent_move)
+                    # fen_after = chess_env.board.fen() # Unused
+
+                    # Save opponent move
+                    moves.append(
+                        MoveRecord(
+                            fen=fen_before,
+                            expected_move=opponent_move_san,
+                            actual_move=opponent_move_san,
+                            is_illegal=False,
+                            game_id=game_id,
+                        )
+                    )
+                except Exception as e:
+                    self.logger.error(f"Error processing opponent move {solution[i]}: {e}")
+                    return None
+
+                # 2. Model's move
+                try:
+                    expected_move_san = chess_env.board.san(solution_moves[i + 1])
+                except IndexError:
+                    # Puzzle might end on opponent move (unlikely for tactic puzzles but possible)
+                    break
+
+                color = chess_env.get_turn_color()
+                legal_moves = chess_env.get_legal_moves()
+                # Reuse this ply's legal moves for every legality check below
+                legal_set = frozenset(legal_moves)
+                fen_for_model = chess_env.board.fen()
+
+                self.logger.debug(f"Expected model move: {expected_move_san}")
+
+                # Get move from agent
+                result = await self.agent.get_move(fen_for_model, legal_moves, color)
+
+                if not result:
+                    self.logger.error("Agent failed to generate move")
+                    failed_puzzle = True
+                    break
 
-                while len(illegal_attempts) < 5:
-                    self.logger.warning(f"Illegal move {final_move_san}, retrying")
-                    illegal_attempts.append(final_move_san)
+                move_san, pt, ct = result
+                self.logger.info(f"Model move: {move_san}")
 
-                    self.repository.save_move(
-                        game_id,
+                # Handle illegal moves
+                illegal_attempts: list[SanMove] = []
+                final_move_san = move_san
+
+                if move_san not in legal_set:
+                    failed_puzzle = (
+                        True  # Initially assume failure unless corrected (but actually retry logic)
+                    )
+                    # Wait, original logic retried 5 times. If strictly illegal, we retry.
+
+                    while len(illegal_attempts) < 5:
+                        self.logger.warning(f"Illegal move {final_move_san}, retrying")
+                        illegal_attempts.append(final_move_san)
+
+                        moves.append(
+                            MoveRecord(
+                                fen=fen_for_model,
+                                expected_move=expected_move_san,
+                                actual_move=final_move_san,
+                                is_illegal=True,
+                                prompt_tokens=pt,
+                                completion_tokens=ct,
+                                game_id=game_id,
+                            )
+                        )
+
+                        retry_result = await self.agent.retry_move(
+                            illegal_attempts, fen_for_model, legal_moves, color
+                        )
+                        if not retry_result:
+                            break  # Failed to retry
+
+                        final_move_san, pt, ct = retry_result
+                        if final_move_san in legal_set:
+                            failed_puzzle = False  # Recovered
+                            break
+
+                # Check legality one last time
+                if final_move_san not in legal_set:
+                    self.logger.error(f"Move {final_move_san} still illegal after retries")
+                    moves.append(
                         MoveRecord(
                             fen=fen_for_model,
                             expected_move=expected_move_san,
@@ -147,60 +184,39 @@ class Evaluator:
                             prompt_tokens=pt,
                             completion_tokens=ct,
                             game_id=game_id,
-                        ),
+                        )
                     )
+                    failed_puzzle = True
+                    break
 
-                    retry_result = await self.agent.retry_move(
-                        illegal_attempts, fen_for_model, legal_moves, color
-                    )
-                    if not retry_result:
-                        break  # Failed to retry
-
-                    final_move_san, pt, ct = retry_result
-                    if chess_env.is_move_legal(final_move_san):
-                        failed_puzzle = False  # Recovered
-                        break
-
-            # Check legality one last time
-            if not chess_env.is_move_legal(final_move_san):
-                self.logger.error(f"Move {final_move_san} still illegal after retries")
-                self.repository.save_move(
-                    game_id,
+                # Apply valid move
+                chess_env.apply_move(final_move_san)
+                moves.append(
                     MoveRecord(
                         fen=fen_for_model,
                         expected_move=expected_move_san,
                         actual_move=final_move_san,
-                        is_illegal=True,
+                        is_illegal=False,
                         prompt_tokens=pt,
                         completion_tokens=ct,
                         game_id=game_id,
-                    ),
+                    )
                 )
-                failed_puzzle = True
-                break
-
-            # Apply valid move
-            chess_env.apply_move(final_move_san)
-            self.repository.save_move(
-                game_id,
-                MoveRecord(
-                    fen=fen_for_model,
-                    expected_move=expected_move_san,
-                    actual_move=final_move_san,
-                    is_illegal=False,
-                    prompt_tokens=pt,
-                    completion_tokens=ct,
-                    game_id=game_id,
-                ),
-            )
-
-            # Check correctness against solution
-            if final_move_san != expected_move_san:
-                self.logger.info(f"Move {final_move_san} != Expected {expected_move_san}")
-                failed_puzzle = True
-                break
-
-        self.repository.update_game_result(game_id, failed_puzzle)
+
+                # Check correctness against solution
+                if final_move_san != expected_move_san:
+                    self.logger.info(f"Move {final_move_san} != Expected {expected_move_san}")
+                    failed_puzzle = True
+                    break
+            finished = True
+        finally:
+            # Moves of a game that errored out are still kept for debugging
+            with self.repository.transaction():
+                if moves:
+                    self.repository.save_moves(game_id, moves)
+                if finished:
+                    self.repository.update_game_result(game_id, failed_puzzle)
+
         return game_id, (puzzle.rating, puzzle.rating_deviation, not failed_puzzle)
 
     async def evaluate_all(
@@ -212,36 +228,46 @@ class Evaluator:
             return
 
         self.logger.info(f"Evaluating {len(self.puzzles)} puzzles (concurrency={max_concurrent})")
-        sem = asyncio.Semaphore(max_concurrent)
+        # A fixed pool of workers pulls puzzles from one shared iterator, so the number of
+        # tasks stays at max_concurrent however many puzzles there are
+        remaining = iter(self.puzzles)
+        completed_count = 0
+        target_reached = False
 
-        async def sem_task(puzzle: Puzzle) -> tuple[int, int, bool, float] | None:
-            async with sem:
+        async def worker() -> None:
+            nonlocal completed_count, target_reached
+            for puzzle in remaining:
                 result = await self.evaluate_puzzle(puzzle)
                 if result is None:
-                    return None
+                    continue
 
                 game_id, (pr, pd, success) = result
                 nr, nrd, nvol = self.update_agent_rating([pr], [pd], [success])
 
-                self.repository.save_benchmark(game_id, nr, nrd, nvol)
-                return (pr, pd, success, nrd)
-
-        tasks = [asyncio.create_task(sem_task(p)) for p in self.puzzles]
-
-        # Wait for all tasks
-        completed_count = 0
-        for coro in asyncio.as_completed(tasks):
-            res = await coro
-            if res:
+                self.repository.save_benchmark(game_id, nr, nrd, nvol, agent_name=self.agent.name)
                 completed_count += 1
-                _, _, _, current_rd = res
-                if target_deviation and current_rd <= target_deviation:
-                    self.logger.info(
-                        f"Target RD {target_deviation} reached. Cancelling remaining tasks."
-                    )
-                    for t in tasks:
-                        if not t.done():
-                            t.cancel()
-                    break
+                if target_deviation and nrd <= target_deviation:
+                    target_reached = True
+                    return
+
+        workers = {
+            asyncio.create_task(worker()) for _ in range(min(max_concurrent, len(self.puzzles)))
+        }
+        try:
+            while workers and not target_reached:
+                done, workers = await asyncio.wait(workers, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()  # Re-raise a worker's error
+
+            if target_reached:
+                self.logger.info(
+                    f"Target RD {target_deviation} reached. Cancelling remaining tasks."
+                )
+        finally:
+            # Cancel the workers still running and wait for them to unwind,
+            # so no task outlives this call (including when a worker raised).
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
         self.logger.info(f"Evaluation complete. Processed {completed_count} puzzles.")
@@ -0,0 +1,49 @@
+"""JSON encode/decode helpers for the data layer.
+
+Uses orjson when available and falls back to the standard library otherwise.
+Both directions work on UTF-8 bytes, so callers should open files in binary mode.
+"""
+
+import mmap
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+
+    def dumps(obj: Any, *, indent: bool = False) -> bytes:
+        """Serialize ``obj`` to compact JSON bytes, or 2-space indented if ``indent``."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+
+    def loads(raw: bytes | str) -> Any:
+        """Deserialize JSON from bytes or str."""
+        return orjson.loads(raw)
+
+    def load_file(path: Path) -> Any:
+        """Deserialize a JSON file, parsing straight from a read-only memory map."""
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                # Empty files can't be mapped; let the parser raise its usual error
+                return orjson.loads(b"")
+            with (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+                memoryview(mapped) as view,
+            ):
+                return orjson.loads(view)
+
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    import json
+
+    def dumps(obj: Any, *, indent: bool = False) -> bytes:
+        """Serialize ``obj`` to compact JSON bytes, or 2-space indented if ``indent``."""
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(raw: bytes | str) -> Any:
+        """Deserialize JSON from bytes or str."""
+        return json.loads(raw)
+
+    def load_file(path: Path) -> Any:
+        """Deserialize a JSON file."""
+        return json.loads(path.read_bytes())
@@ -1,85 +1,106 @@
-import json
+import contextlib
 import logging
+import shutil
 import sqlite3
-import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
+from chess_llm_eval.data import _fastjson
 from chess_llm_eval.data.models import Puzzle
 from chess_llm_eval.data.sqlite import SQLiteRepository
 
 logger = logging.getLogger(__name__)
 
 
+# Number of puzzles saved per transaction when importing JSON Lines backups
+IMPORT_BATCH_SIZE = 10_000
+
+
 class PuzzleBackup:
-    """Helper class to backup and restore puzzles from JSON."""
+    """Helper class to backup and restore puzzles from JSON.
+
+    Paths ending in ``.jsonl`` use JSON Lines (one puzzle object per line), which is
+    streamed in both directions; any other path uses a single JSON array.
+    """
 
     def __init__(self, db_path: str = "data/storage.db") -> None:
         self.db_path = db_path
         self.repo = SQLiteRepository(db_path)
 
-    def export_puzzles_to_json(self, json_path: str = "data/puzzles.json") -> None:
-        """Exports all puzzles from the database to a JSON file."""
-        puzzles = self.repo.get_puzzles()
-
-        # Convert Puzzle objects to dictionaries
-        puzzles_data = []
-        for p in puzzles:
-            puzzles_data.append(
-                {
-                    "id": p.id,
-                    "fen": p.fen,
-                    "moves": p.moves,
-                    "rating": p.rating,
-                    "rating_deviation": p.rating_deviation,
-                    "popularity": p.popularity,
-                    "nb_plays": p.nb_plays,
-                    "themes": p.themes,
-                    "game_url": p.game_url,
-                    "opening_tags": p.opening_tags,
-                    "type": p.type,
-                }
-            )
+    def export_puzzles_to_json(
+        self, json_path: str = "data/puzzles.json", pretty: bool = False
+    ) -> None:
+        """Exports all puzzles from the database to a JSON or JSON Lines file.
 
+        JSON arrays are written compactly unless ``pretty`` is set, which indents them
+        for reading by hand. JSON Lines output is always one compact object per line.
+        """
         output_path = Path(json_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(puzzles_data, f, indent=2)
-
-        logger.info(f"Exported {len(puzzles)} puzzles to {output_path}")
+        # Rows are streamed straight from SQLite without building Puzzle objects
+        rows = self.repo.iter_puzzle_rows()
+        with open(output_path, "wb") as f:
+            if output_path.suffix == ".jsonl":
+                count = 0
+                for row in rows:
+                    f.write(_fastjson.dumps(row) + b"\n")
+                    count += 1  # noqa: SIM113 - rows is a generator
+            else:
+                puzzles_data = list(rows)
+                f.write(_fastjson.dumps(puzzles_data, indent=pretty))
+                count = len(puzzles_data)
+
+        logger.info(f"Exported {count} puzzles to {output_path}")
 
     def import_puzzles_from_json(self, json_path: str = "data/puzzles.json") -> None:
-        """Imports puzzles from a JSON file into the database."""
+        """Imports puzzles from a JSON or JSON Lines file into the database."""
         input_path = Path(json_path)
         if not input_path.exists():
             logger.warning(f"JSON file not found: {input_path}")
             return
 
-        with open(input_path, encoding="utf-8") as f:
-            puzzles_data = json.load(f)
-
-        puzzles = []
-        for p_data in puzzles_data:
-            puzzles.append(
-                Puzzle(
-                    id=p_data.get("id", ""),
-                    fen=p_data.get("fen", ""),
-                    moves=p_data.get("moves", ""),
-                    rating=p_data.get("rating") or 1500,
-                    rating_deviation=p_data.get("rating_deviation") or 350,
-                    popularity=p_data.get("popularity") or 0,
-                    nb_plays=p_data.get("nb_plays") or 0,
-                    themes=p_data.get("themes") or "",
-                    game_url=p_data.get("game_url") or "",
-                    opening_tags=p_data.get("opening_tags") or "",
-                    type=p_data.get("type") or "unknown",
-                )
-            )
-
-        self.repo.save_puzzles(puzzles)
-        logger.info(f"Imported {len(puzzles)} puzzles from {input_path}")
+        if input_path.suffix == ".jsonl":
+            # Save in bounded batches so memory stays flat regardless of file size
+            count = 0
+            batch: list[Puzzle] = []
+            with open(input_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    batch.append(_puzzle_from_dict(_fastjson.loads(line)))
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        self.repo.save_puzzles(batch)
+                        count += len(batch)
+                        batch = []
+            if batch:
+                self.repo.save_puzzles(batch)
+                count += len(batch)
+        else:
+            puzzles = [_puzzle_from_dict(p) for p in _fastjson.loads(input_path.read_bytes())]
+            self.repo.save_puzzles(puzzles)
+            count = len(puzzles)
+
+        logger.info(f"Imported {count} puzzles from {input_path}")
+
+
+def _puzzle_from_dict(p_data: dict[str, Any]) -> Puzzle:
+    return Puzzle(
+        id=p_data.get("id", ""),
+        fen=p_data.get("fen", ""),
+        moves=p_data.get("moves", ""),
+        rating=p_data.get("rating") or 1500,
+        rating_deviation=p_data.get("rating_deviation") or 350,
+        popularity=p_data.get("popularity") or 0,
+        nb_plays=p_data.get("nb_plays") or 0,
+        themes=p_data.get("themes") or "",
+        game_url=p_data.get("game_url") or "",
+        opening_tags=p_data.get("opening_tags") or "",
+        type=p_data.get("type") or "unknown",
+    )
 
 
 class FullDatabaseBackup:
@@ -88,7 +109,6 @@ class FullDatabaseBackup:
     def __init__(self, db_path: str = "data/storage.db") -> None:
         self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row
 
     def export_all_to_json(self, json_path: str | None = None) -> str:
         """Exports all tables to a single JSON file."""
@@ -99,27 +119,63 @@ class FullDatabaseBackup:
         output_path = Path(json_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        data: dict[str, Any] = {
-            "metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "db_path": str(self.db_path),
-            },
-            "tables": {},
+        metadata = {
+            "timestamp": datetime.now().isoformat(),
+            "db_path": str(self.db_path),
         }
 
+        # Write the document incrementally, one row per line, so no table is ever
+        # held in memory as a whole. Tables are independent, so each is read on its
+        # own read-only connection into a temp file, then stitched together in order.
         tables = ["puzzle", "agent", "game", "move", "benchmark"]
-        for table in tables:
-            cursor = self.conn.execute(f"SELECT * FROM {table}")
-            data["tables"][table] = [dict(row) for row in cursor.fetchall()]
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        with (
+            contextlib.ExitStack() as stack,
+            ThreadPoolExecutor(max_workers=len(tables)) as executor,
+        ):
+            table_files = [stack.enter_context(tempfile.TemporaryFile()) for _ in tables]
+            exports = [
+                executor.submit(self._export_table, table, table_file)
+                for table, table_file in zip(tables, table_files, strict=True)
+            ]
+
+            with open(output_path, "wb") as f:
+                f.write(b'{"metadata":' + _fastjson.dumps(metadata) + b',\n"tables":{')
+                for i, (table, table_file, export) in enumerate(
+                    zip(tables, table_files, exports, strict=True)
+                ):
+                    export.result()
+                    if i:
+                        f.write(b",")
+                    f.write(b"\n" + _fastjson.dumps(table) + b":[")
+                    table_file.seek(0)
+                    shutil.copyfileobj(table_file, f)
+                    f.write(b"]")
+                f.write(b"\n}}\n")
 
         logger.info(f"Full JSON backup created at {output_path}")
         return str(output_path)
 
-    def sqlite_dump(self, dump_path: str | None = None) -> str:
-        """Creates a SQL dump of the database."""
+    def _export_table(self, table: str, f: BinaryIO) -> None:
+        """Writes a table's rows to ``f`` as comma-separated JSON objects, one per line."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        with contextlib.closing(sqlite3.connect(uri, uri=True)) as conn:
+            cursor = conn.execute(f"SELECT * FROM {table}")
+            columns = tuple(description[0] for description in cursor.description)
+            separator = b"\n"
+            for row in cursor:
+                f.write(separator + _fastjson.dumps(dict(zip(columns, row, strict=True))))
+                separator = b",\n"
+
+    def sqlite_dump(self, dump_path: str | None = None, sql_text: bool = False) -> str:
+        """Creates a snapshot of the database.
+
+        By default this is a binary copy made with SQLite's online backup API, which
+        copies pages directly and restores by simply opening the file. Pass
+        ``sql_text=True`` for a portable SQL text dump instead.
+        """
+        if not sql_text:
+            return self.sqlite_binary_backup(dump_path)
+
         if not dump_path:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             dump_path = f"data/backups/db_dump_{timestamp}.sql"
@@ -128,36 +184,58 @@ class FullDatabaseBackup:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(output_path, "w", encoding="utf-8") as f:
-            # Use sqlite3 CLI if available for a clean dump
-            try:
-                subprocess.run(
-                    ["sqlite3", self.db_path, ".dump"],
-                    stdout=f,
-                    check=True,
-                    capture_output=False,
-                )
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                # Fallback to internal iteration if sqlite3 CLI is missing
-                logger.warning("sqlite3 CLI not found, using internal dump fallback")
-                for line in self.conn.iterdump():
-                    f.write(f"{line}\n")
+            f.writelines(f"{line}\n" for line in self.conn.iterdump())
 
         logger.info(f"SQLite dump created at {output_path}")
         return str(output_path)
 
-    def restore_from_json(self, json_path: str) -> None:
-        """Restores the database from a JSON backup file."""
+    def sqlite_binary_backup(self, backup_path: str | None = None) -> str:
+        """Copies the database to a new SQLite file using the online backup API."""
+        if not backup_path:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path = f"data/backups/db_backup_{timestamp}.db"
+
+        output_path = Path(backup_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with contextlib.closing(sqlite3.connect(output_path)) as dest:
+            self.conn.backup(dest)
+
+        logger.info(f"SQLite backup created at {output_path}")
+        return str(output_path)
+
+    def restore_from_json(self, json_path: str, snapshot_path: str | None = None) -> None:
+        """Restores the database from a JSON backup file.
+
+        The restore skips fsyncs and keeps its journal in memory, so a crash part-way
+        through can corrupt the target file. A binary snapshot of the target is taken
+        first (next to the database unless ``snapshot_path`` is given) to recover from.
+        """
         input_path = Path(json_path)
         if not input_path.exists():
             raise FileNotFoundError(f"Backup file not found: {input_path}")
 
-        with open(input_path, encoding="utf-8") as f:
-            data = json.load(f)
+        data = _fastjson.loads(input_path.read_bytes())
+
+        if not snapshot_path:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            db_file = Path(self.db_path)
+            snapshot_path = str(
+                db_file.with_name(f"{db_file.stem}_pre_restore_{timestamp}{db_file.suffix}")
+            )
+        snapshot_path = self.sqlite_binary_backup(snapshot_path)
+        logger.info(f"Pre-restore snapshot of {self.db_path} written to {snapshot_path}")
 
         cursor = self.conn.cursor()
+        journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
 
-        # Disable foreign keys during restore
+        # Disable foreign keys during restore. An exception rolls the transaction back,
+        # but with fsyncs off and the journal in memory the target file is unrecoverable
+        # if the process dies mid-restore; only the snapshot above survives that.
         cursor.execute("PRAGMA foreign_keys = OFF")
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
 
         try:
             for table_name, rows in data["tables"].items():
@@ -165,16 +243,21 @@ class FullDatabaseBackup:
                     continue
 
                 cursor.execute(f"DELETE FROM {table_name}")
-                columns = rows[0].keys()
+                columns = list(rows[0].keys())
                 placeholders = ", ".join(["?"] * len(columns))
                 query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
 
-                values = [tuple(row[col] for col in columns) for row in rows]
-                cursor.executemany(query, values)
+                # Feed rows lazily instead of copying the whole table into a list
+                cursor.executemany(query, (tuple(row[col] for col in columns) for row in rows))
                 logger.info(f"Restored {len(rows)} rows to {table_name}")
 
             self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
         finally:
             cursor.execute("PRAGMA foreign_keys = ON")
+            cursor.execute(f"PRAGMA synchronous = {synchronous}")
+            cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
 
         logger.info("Database restoration complete")
@@ -4,19 +4,34 @@ This module provides a read-only repository that loads data from JSON files,
 designed for Vercel serverless functions where SQLite is problematic.
 """
 
-import json
 import logging
+from contextlib import AbstractContextManager
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
+from typing import Any
 
 import pandas as pd
 
+from chess_llm_eval.data import _fastjson
 from chess_llm_eval.data.models import AgentData, AgentRanking, Game, MoveRecord, Puzzle
 from chess_llm_eval.data.protocols import GameRepository
 
 logger = logging.getLogger(__name__)
 
 
+def _decategorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert categorical columns back to plain object columns.
+
+    Categories only speed up the groupbys inside this module; returned frames have the
+    same column types as SQLiteRepository's.
+    """
+    categorical = df.select_dtypes("category").columns
+    if categorical.empty:
+        return df
+    return df.astype(dict.fromkeys(categorical, object))
+
+
 class JSONRepository(GameRepository):
     """JSON-based implementation of GameRepository for read-only serverless deployment.
 
@@ -47,32 +62,50 @@ class JSONRepository(GameRepository):
         self.json_path = Path(json_path)
         logger.info(f"Loading data from {self.json_path}")
 
-        # Load JSON data
-        with open(self.json_path, encoding="utf-8") as f:
-            data = json.load(f)
-
-        # Convert to DataFrames for efficient querying
-        self.puzzles_df = pd.DataFrame(data["puzzle"])
-        self.agents_df = pd.DataFrame(data["agent"])
-        self.games_df = pd.DataFrame(data["game"])
-        self.moves_df = pd.DataFrame(data["move"])
-        self.benchmarks_df = pd.DataFrame(data["benchmark"])
-
-        if "failed" in self.games_df.columns:
-            self.games_df["failed"] = self.games_df["failed"].fillna(0).astype(bool)
+        # Parse straight from a memory map of the file; no intermediate text or bytes copy
+        data = _fastjson.load_file(self.json_path)
 
         # Pre-computed analytics (optional, for better performance)
         self.analytics = data.get("analytics", {})
 
+        # Keep the raw row dicts; row-at-a-time reads use them directly, and the
+        # DataFrames for the vectorized analytics are built from them on first use.
+        self.puzzles_list: list[dict[str, Any]] = data["puzzle"]
+        self.agents_list: list[dict[str, Any]] = data["agent"]
+        self.games_list: list[dict[str, Any]] = data["game"]
+        self.moves_list: list[dict[str, Any]] = data["move"]
+        self.benchmarks_list: list[dict[str, Any]] = data["benchmark"]
+
         # Build lookup indexes for O(1) access
         self.puzzle_by_id = {p["id"]: p for p in data["puzzle"]}
         self.agent_by_name = {a["name"]: a for a in data["agent"]}
+        self.game_by_id = {g["id"]: g for g in data["game"]}
+        self.attempted_by_agent: dict[str, set[str]] = {}
+        for game in data["game"]:
+            self.attempted_by_agent.setdefault(game["agent_name"], set()).add(game["puzzle_id"])
+        self.moves_by_game: dict[int, list[dict[str, Any]]] = {}
+        for move in data["move"]:
+            self.moves_by_game.setdefault(move["game_id"], []).append(move)
+        self.move_count_by_game = {
+            game_id: len(moves) for game_id, moves in self.moves_by_game.items()
+        }
+
+        # Latest benchmark (highest game_id) per agent, so rating lookups don't
+        # re-join benchmarks with games on every call
+        self.latest_benchmark_by_agent: dict[str, dict[str, Any]] = {}
+        for bench in data["benchmark"]:
+            game = self.game_by_id.get(bench["game_id"])
+            if game is None:
+                continue
+            current = self.latest_benchmark_by_agent.get(game["agent_name"])
+            if current is None or bench["game_id"] > current["game_id"]:
+                self.latest_benchmark_by_agent[game["agent_name"]] = bench
 
         logger.info(
-            f"Loaded: {len(self.puzzles_df)} puzzles, "
-            f"{len(self.agents_df)} agents, "
-            f"{len(self.games_df)} games, "
-            f"{len(self.moves_df)} moves"
+            f"Loaded: {len(self.puzzles_list)} puzzles, "
+            f"{len(self.agents_list)} agents, "
+            f"{len(self.games_list)} games, "
+            f"{len(self.moves_list)} moves"
         )
 
     def get_puzzles(self, limit: int | None = None) -> list[Puzzle]:
@@ -84,8 +117,8 @@ class JSONRepository(GameRepository):
         Returns:
             List of Puzzle objects.
         """
-        df = self.puzzles_df.head(limit) if limit else self.puzzles_df
-        return [Puzzle(**row) for _, row in df.iterrows()]
+        puzzles = self.puzzles_list[:limit] if limit else self.puzzles_list
+        return [Puzzle(**p) for p in puzzles]
 
     def get_puzzle(self, puzzle_id: str) -> Puzzle | None:
         """Get a single puzzle by ID.
@@ -97,7 +130,11 @@ class JSONRepository(GameRepository):
             Puzzle object or None if not found.
         """
         puzzle = self.puzzle_by_id.get(puzzle_id)
-        return Puzzle(**puzzle) if puzzle else None
+        if not puzzle:
+            return None
+
+        # Built per call: Puzzle is mutable, so a shared instance could be changed by a caller
+        return Puzzle(**puzzle)
 
     def get_uncompleted_puzzles(self, agent_name: str, limit: int | None = None) -> list[Puzzle]:
         """Get puzzles not yet attempted by an agent.
@@ -109,15 +146,17 @@ class JSONRepository(GameRepository):
         Returns:
             List of Puzzle objects not yet attempted.
         """
-        # Get puzzles already attempted by this agent
-        attempted = self.games_df[self.games_df["agent_name"] == agent_name]["puzzle_id"].unique()
+        attempted: set[str] | frozenset[str] = self.attempted_by_agent.get(agent_name, frozenset())
 
-        # Filter puzzles
-        uncompleted = self.puzzles_df[~self.puzzles_df["id"].isin(attempted)]
-        if limit:
-            uncompleted = uncompleted.head(limit)
+        uncompleted: list[Puzzle] = []
+        for p in self.puzzles_list:
+            if p["id"] in attempted:
+                continue
+            uncompleted.append(Puzzle(**p))
+            if limit and len(uncompleted) >= limit:
+                break
 
-        return [Puzzle(**row) for _, row in uncompleted.iterrows()]
+        return uncompleted
 
     def get_agent(self, name: str) -> AgentData | None:
         """Get agent data by name.
@@ -132,26 +171,7 @@ class JSONRepository(GameRepository):
         if not agent:
             return None
 
-        # Get latest benchmark if available
-        benchmarks = self.benchmarks_df.merge(
-            self.games_df[["id", "agent_name"]], left_on="game_id", right_on="id"
-        )
-        latest = (
-            benchmarks[benchmarks["agent_name"] == name]
-            .sort_values("game_id", ascending=False)
-            .head(1)
-        )
-
-        if not latest.empty:
-            agent = agent.copy()
-            agent["rating"] = latest.iloc[0]["agent_rating"]
-            agent["rd"] = latest.iloc[0]["agent_deviation"]
-
-        # Map field names from JSON to AgentData model
-        agent["is_reasoning"] = agent.pop("reasoning", agent.get("is_reasoning", False))
-        agent["is_random"] = agent.pop("random", agent.get("is_random", False))
-
-        return AgentData(**agent)
+        return self._to_agent_data(agent)
 
     def get_all_agents(self) -> list[AgentData]:
         """Get all agents.
@@ -159,31 +179,22 @@ class JSONRepository(GameRepository):
         Returns:
             List of AgentData objects with latest ratings.
         """
-        agents = []
-        for _, agent_row in self.agents_df.iterrows():
-            agent = agent_row.to_dict()
+        return [self._to_agent_data(agent) for agent in self.agents_list]
 
-            # Get latest benchmark
-            benchmarks = self.benchmarks_df.merge(
-                self.games_df[["id", "agent_name"]], left_on="game_id", right_on="id"
-            )
-            latest = (
-                benchmarks[benchmarks["agent_name"] == agent["name"]]
-                .sort_values("game_id", ascending=False)
-                .head(1)
-            )
-
-            if not latest.empty:
-                agent["rating"] = latest.iloc[0]["agent_rating"]
-                agent["rd"] = latest.iloc[0]["agent_deviation"]
+    def _to_agent_data(self, agent_row: dict[str, Any]) -> AgentData:
+        agent = dict(agent_row)
 
-            # Map field names from JSON to AgentData model
-            agent["is_reasoning"] = agent.pop("reasoning", agent.get("is_reasoning", False))
-            agent["is_random"] = agent.pop("random", agent.get("is_random", False))
+        # Overlay the latest benchmark if available
+        latest = self.latest_benchmark_by_agent.get(agent["name"])
+        if latest is not None:
+            agent["rating"] = latest["agent_rating"]
+            agent["rd"] = latest["agent_deviation"]
 
-            agents.append(AgentData(**agent))  # type: ignore[misc]
+        # Map field names from JSON to AgentData model
+        agent["is_reasoning"] = agent.pop("reasoning", agent.get("is_reasoning", False))
+        agent["is_random"] = agent.pop("random", agent.get("is_random", False))
 
-        return agents
+        return AgentData(**agent)
 
     def get_last_benchmark(self, agent_name: str) -> tuple[float, float, float] | None:
         """Get the last benchmark rating for an agent.
@@ -194,22 +205,14 @@ class JSONRepository(GameRepository):
         Returns:
             Tuple of (rating, deviation, volatility) or None.
         """
-        benchmarks = self.benchmarks_df.merge(
-            self.games_df[["id", "agent_name"]], left_on="game_id", right_on="id"
-        )
-        latest = (
-            benchmarks[benchmarks["agent_name"] == agent_name]
-            .sort_values("game_id", ascending=False)
-            .head(1)
-        )
-
-        if latest.empty:
+        latest = self.latest_benchmark_by_agent.get(agent_name)
+        if latest is None:
             return None
 
         return (
-            latest.iloc[0]["agent_rating"],
-            latest.iloc[0]["agent_deviation"],
-            latest.iloc[0]["agent_volatility"],
+            latest["agent_rating"],
+            latest["agent_deviation"],
+            latest["agent_volatility"],
         )
 
     def get_game(self, game_id: int) -> Game | None:
@@ -221,25 +224,25 @@ class JSONRepository(GameRepository):
         Returns:
             Game object with moves or None if not found.
         """
-        game_row = self.games_df[self.games_df["id"] == game_id]
-        if game_row.empty:
+        game_row = self.game_by_id.get(game_id)
+        if game_row is None:
             return None
 
-        game = game_row.iloc[0].to_dict()
+        game = dict(game_row)
 
         puzzle_type = ""
-        puzzle_match = self.puzzles_df[self.puzzles_df["id"] == game.get("puzzle_id")]
-        if not puzzle_match.empty:
-            puzzle_type = puzzle_match.iloc[0]["type"]
+        puzzle = self.puzzle_by_id.get(game.get("puzzle_id"))
+        if puzzle is not None:
+            puzzle_type = puzzle["type"]
 
         game["puzzle_type"] = puzzle_type
-        game["failed"] = bool(game.get("failed", False))
+        game["failed"] = bool(game.get("failed") or False)
 
         if "date" in game:
             game["date"] = self._parse_datetime(game["date"])
 
         # Get moves for this game
-        moves = self.moves_df[self.moves_df["game_id"] == game_id]
+        moves = self.moves_by_game.get(game_id, [])
         game["moves"] = [
             MoveRecord(
                 id=row.get("id"),
@@ -251,11 +254,11 @@ class JSONRepository(GameRepository):
                 prompt_tokens=row.get("prompt_tokens", 0) or 0,
                 completion_tokens=row.get("completion_tokens", 0) or 0,
             )
-            for _, row in moves.iterrows()
+            for row in moves
         ]
         game["move_count"] = len(game["moves"])
 
-        return Game(**game)  # type: ignore[misc]
+        return Game(**game)
 
     def get_agent_games(self, agent_name: str) -> list[Game]:
         """Get all games for an agent (without move details).
@@ -266,41 +269,24 @@ class JSONRepository(GameRepository):
         Returns:
             List of Game objects.
         """
-        games = self.games_df[self.games_df["agent_name"] == agent_name].copy()
-        if games.empty:
-            return []
-
-        games = games.merge(
-            self.puzzles_df[["id", "type"]],
-            left_on="puzzle_id",
-            right_on="id",
-            how="left",
-        )
-        games = games.rename(columns={"type": "puzzle_type"})
-
-        move_counts = (
-            self.moves_df.groupby("game_id")["id"].count().rename("move_count")
-        )
-        games = games.merge(move_counts, left_on="id_x", right_on="game_id", how="left")
-        games["move_count"] = games["move_count"].fillna(0).astype(int)
-        games["failed"] = games["failed"].fillna(0).astype(bool)
-
-        if "date" in games.columns:
-            games["date"] = games["date"].apply(self._parse_datetime)
-
-        return [
-            Game(
-                id=row["id_x"],
-                puzzle_id=row["puzzle_id"],
-                puzzle_type=row.get("puzzle_type", ""),
-                agent_name=row["agent_name"],
-                failed=bool(row["failed"]),
-                date=row["date"],
-                moves=[],
-                move_count=int(row["move_count"]),
+        games = []
+        for game in self.games_list:
+            if game["agent_name"] != agent_name:
+                continue
+            puzzle = self.puzzle_by_id.get(game["puzzle_id"])
+            games.append(
+                Game(
+                    id=game["id"],
+                    puzzle_id=game["puzzle_id"],
+                    puzzle_type=puzzle["type"] if puzzle is not None else "",
+                    agent_name=game["agent_name"],
+                    failed=bool(game["failed"] or False),
+                    date=self._parse_datetime(game["date"]),
+                    moves=[],
+                    move_count=self.move_count_by_game.get(game["id"], 0),
+                )
             )
-            for _, row in games.iterrows()
-        ]
+        return games
 
     @staticmethod
     def _parse_datetime(value: object) -> datetime:
@@ -314,6 +300,76 @@ class JSONRepository(GameRepository):
                 return datetime.now()
         return datetime.now()
 
+    # DataFrames over the raw rows, only built when an analytics method first needs
+    # them. Each holds its own copy of the data, so they are not built at load time.
+    @cached_property
+    def puzzles_df(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.puzzles_list)
+        # Puzzle types and agent names repeat across every row; categorical codes make
+        # the analytics groupbys hash small integers instead of strings. Those groupbys
+        # pass observed=True so unused categories don't come back as empty groups
+        if "type" in df.columns:
+            df["type"] = df["type"].astype("category")
+        return df
+
+    @cached_property
+    def agents_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.agents_list)
+
+    @cached_property
+    def games_df(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.games_list)
+        if "failed" in df.columns:
+            df["failed"] = df["failed"].fillna(0).astype(bool)
+        if "agent_name" in df.columns:
+            df["agent_name"] = df["agent_name"].astype("category")
+        return df
+
+    @cached_property
+    def moves_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.moves_list)
+
+    @cached_property
+    def benchmarks_df(self) -> pd.DataFrame:
+        return pd.DataFrame(self.benchmarks_list)
+
+    # Joined frames shared by the analytics methods. Built on first use and cached,
+    # since the underlying data never changes after load.
+    @cached_property
+    def _moves_with_games(self) -> pd.DataFrame:
+        merged = self.moves_df.merge(
+            self.games_df[["id", "agent_name", "puzzle_id"]],
+            left_on="game_id",
+            right_on="id",
+        )
+        merged["is_correct"] = merged["move"] == merged["correct_move"]
+        return merged
+
+    @cached_property
+    def _games_with_puzzles(self) -> pd.DataFrame:
+        return self.games_df.merge(
+            self.puzzles_df[["id", "type"]],
+            left_on="puzzle_id",
+            right_on="id",
+        )
+
+    @cached_property
+    def _benchmarks_with_games(self) -> pd.DataFrame:
+        merged = self.benchmarks_df.merge(
+            self.games_df[["id", "agent_name", "date"]],
+            left_on="game_id",
+            right_on="id",
+        )
+        merged = merged.sort_values("id_x").copy()
+        merged["evaluation_index"] = merged.groupby("agent_name", observed=True).cumcount() + 1
+        merged["date"] = pd.to_datetime(merged["date"], errors="coerce")
+        return merged
+
+    @cached_property
+    def _attempted_puzzles(self) -> pd.DataFrame:
+        attempted: set[str] = set().union(*self.attempted_by_agent.values())
+        return self.puzzles_df[self.puzzles_df["id"].isin(attempted)]
+
     def get_leaderboard(self) -> list[AgentRanking]:
         """Get leaderboard data.
 
@@ -333,21 +389,32 @@ class JSONRepository(GameRepository):
                 for item in self.analytics["leaderboard"]
             ]
 
-        # Compute on-the-fly
+        return list(self._computed_leaderboard)
+
+    @cached_property
+    def _computed_leaderboard(self) -> list[AgentRanking]:
+        # Tally games and wins per agent in one pass over the games
+        totals: dict[str, int] = {}
+        wins: dict[str, int] = {}
+        for game in self.games_list:
+            name = game["agent_name"]
+            totals[name] = totals.get(name, 0) + 1
+            if not game.get("failed"):
+                wins[name] = wins.get(name, 0) + 1
+
         rankings = []
-        for agent_name in self.agents_df["name"]:
-            games = self.games_df[self.games_df["agent_name"] == agent_name]
-            if games.empty:
+        for agent in self.agents_list:
+            agent_name = agent["name"]
+            total = totals.get(agent_name, 0)
+            if total == 0:
                 continue
 
-            total = len(games)
-            wins = len(games[games["failed"] == 0])
-            win_rate = (wins / total * 100) if total > 0 else 0.0
+            win_rate = wins.get(agent_name, 0) / total * 100
 
             # Get latest rating
-            latest = self.get_last_benchmark(agent_name)
-            rating = latest[0] if latest else 1500.0
-            rd = latest[1] if latest else 350.0
+            latest = self.latest_benchmark_by_agent.get(agent_name)
+            rating = latest["agent_rating"] if latest else 1500.0
+            rd = latest["agent_deviation"] if latest else 350.0
 
             rankings.append(
                 AgentRanking(
@@ -363,41 +430,26 @@ class JSONRepository(GameRepository):
 
     def get_benchmark_data(self) -> pd.DataFrame:
         """Get benchmark data as DataFrame."""
-        merged = self.benchmarks_df.merge(
-            self.games_df[["id", "agent_name", "date"]],
-            left_on="game_id",
-            right_on="id",
-        )
-        merged = merged.sort_values("id_x").copy()
-        merged["evaluation_index"] = merged.groupby("agent_name").cumcount() + 1
-        merged["date"] = pd.to_datetime(merged["date"], errors="coerce")
-        return merged
+        return _decategorize(self._benchmarks_with_games.copy())
 
     def get_puzzle_outcome_data(self) -> pd.DataFrame:
         """Get puzzle outcome data."""
         if "puzzle_outcomes" in self.analytics:
             return pd.DataFrame(self.analytics["puzzle_outcomes"])
 
-        return (
-            self.games_df.merge(
-                self.puzzles_df[["id", "type"]],
-                left_on="puzzle_id",
-                right_on="id",
-            )
-            .groupby("type")
-            .agg({"failed": ["count", "sum"]})
+        # Same columns as SQLiteRepository: type, successes, failures
+        merged = self._games_with_puzzles
+        return _decategorize(
+            merged.assign(successes=merged["failed"] == 0, failures=merged["failed"] == 1)
+            .groupby("type", observed=True)[["successes", "failures"]]
+            .sum()
             .reset_index()
         )
 
     def get_puzzle_outcome_data_by_agent(self) -> pd.DataFrame:
         """Get puzzle outcome data grouped by agent."""
-        return (
-            self.games_df.merge(
-                self.puzzles_df[["id", "type"]],
-                left_on="puzzle_id",
-                right_on="id",
-            )
-            .groupby(["agent_name", "type"])
+        return _decategorize(
+            self._games_with_puzzles.groupby(["agent_name", "type"], observed=True)
             .agg({"failed": ["count", "sum"]})
             .reset_index()
         )
@@ -410,13 +462,8 @@ class JSONRepository(GameRepository):
                 df = df.rename(columns={"illegal_count": "illegal_moves_count"})
             return df
 
-        return (
-            self.moves_df.merge(
-                self.games_df[["id", "agent_name"]],
-                left_on="game_id",
-                right_on="id",
-            )
-            .groupby("agent_name")
+        return _decategorize(
+            self._moves_with_games.groupby("agent_name", observed=True)
             .agg(
                 illegal_moves_count=("illegal_move", "sum"),
                 total_moves=("illegal_move", "count"),
@@ -426,18 +473,17 @@ class JSONRepository(GameRepository):
 
     def get_final_ratings_data(self) -> pd.DataFrame:
         """Get final ratings data."""
-        return (
+        return _decategorize(
             self.get_benchmark_data()
             .sort_values("game_id")
-            .groupby("agent_name")
+            .groupby("agent_name", observed=True)
             .last()[["agent_rating", "agent_deviation", "agent_volatility"]]
             .reset_index()
         )
 
     def get_weighted_puzzle_rating(self) -> tuple[float, float]:
         """Get weighted average puzzle rating."""
-        attempted_puzzles = self.games_df["puzzle_id"].unique()
-        attempted_df = self.puzzles_df[self.puzzles_df["id"].isin(attempted_puzzles)]
+        attempted_df = self._attempted_puzzles
 
         if attempted_df.empty:
             return (0.0, 0.0)
@@ -449,21 +495,9 @@ class JSONRepository(GameRepository):
 
     def get_solutionary_agent_moves(self) -> pd.DataFrame:
         """Get solution vs actual moves data."""
-        return (
-            self.moves_df.merge(
-                self.games_df[["id", "agent_name"]],
-                left_on="game_id",
-                right_on="id",
-            )
-            .groupby("agent_name")
-            .apply(
-                lambda x: pd.Series(
-                    {
-                        "correct_moves": (x["move"] == x["correct_move"]).sum(),
-                        "total_moves": len(x),
-                    }
-                )
-            )
+        return _decategorize(
+            self._moves_with_games.groupby("agent_name", observed=True)
+            .agg(correct_moves=("is_correct", "sum"), total_moves=("is_correct", "count"))
             .reset_index()
         )
 
@@ -480,13 +514,8 @@ class JSONRepository(GameRepository):
                 )
             return df
 
-        return (
-            self.moves_df.merge(
-                self.games_df[["id", "agent_name"]],
-                left_on="game_id",
-                right_on="id",
-            )
-            .groupby("agent_name")
+        return _decategorize(
+            self._moves_with_games.groupby("agent_name", observed=True)
             .agg({"prompt_tokens": "mean", "completion_tokens": "mean"})
             .reset_index()
         )
@@ -504,15 +533,10 @@ class JSONRepository(GameRepository):
                 )
             return df
 
-        return (
-            self.moves_df.merge(
-                self.games_df[["id", "agent_name", "puzzle_id"]],
-                left_on="game_id",
-                right_on="id",
-            )
-            .groupby(["agent_name", "puzzle_id"])
+        return _decategorize(
+            self._moves_with_games.groupby(["agent_name", "puzzle_id"], observed=True)
             .agg({"prompt_tokens": "sum", "completion_tokens": "sum"})
-            .groupby("agent_name")
+            .groupby("agent_name", observed=True)
             .mean()
             .reset_index()
             .rename(
@@ -525,16 +549,13 @@ class JSONRepository(GameRepository):
 
     def get_solutionary_moves_data(self) -> pd.DataFrame:
         """Get detailed solutionary moves data."""
-        return (
-            self.moves_df[self.moves_df["illegal_move"] == 0]
-            .merge(
-                self.games_df[["id", "agent_name"]],
-                left_on="game_id",
-                right_on="id",
-            )
-            .groupby(["agent_name", "correct_move"])
-            .agg({"move": lambda x: (x == x.name).sum()})  # type: ignore[misc]
-            .reset_index()
+        moves = self._moves_with_games
+        legal = moves[moves["illegal_move"] == 0]
+        # Count, per expected move, how often the agent played it
+        return _decategorize(
+            legal.groupby(["agent_name", "correct_move"], observed=True)["is_correct"]
+            .sum()
+            .reset_index(name="move")
         )
 
     def save_agent(self, agent: AgentData) -> None:
@@ -546,20 +567,13 @@ class JSONRepository(GameRepository):
         Retrieve puzzle outcomes grouped by agent and puzzle type.
         Returns columns: agent_name, type, successes, failures.
         """
-        # Merge games with puzzles to get puzzle type
-        merged = self.games_df.merge(
-            self.puzzles_df[["id", "type"]],
-            left_on="puzzle_id",
-            right_on="id",
-        )
+        merged = self._games_with_puzzles
 
         # Group by agent_name and type, count successes and failures
-        return (
-            merged.groupby(["agent_name", "type"])
-            .agg(
-                successes=("failed", lambda x: (x == 0).sum()),
-                failures=("failed", lambda x: (x == 1).sum()),
-            )
+        return _decategorize(
+            merged.assign(successes=merged["failed"] == 0, failures=merged["failed"] == 1)
+            .groupby(["agent_name", "type"], observed=True)[["successes", "failures"]]
+            .sum()
             .reset_index()
         )
 
@@ -568,6 +582,10 @@ class JSONRepository(GameRepository):
         """Not supported in read-only JSON mode."""
         raise NotImplementedError("JSONRepository is read-only")
 
+    def transaction(self) -> AbstractContextManager[None]:
+        """Not supported in read-only JSON mode."""
+        raise NotImplementedError("JSONRepository is read-only")
+
     def create_game(self, puzzle_id: str, agent_name: str) -> int:
         """Not supported in read-only JSON mode."""
         raise NotImplementedError("JSONRepository is read-only")
@@ -576,6 +594,10 @@ class JSONRepository(GameRepository):
         """Not supported in read-only JSON mode."""
         raise NotImplementedError("JSONRepository is read-only")
 
+    def save_moves(self, game_id: int, moves: list[MoveRecord]) -> None:
+        """Not supported in read-only JSON mode."""
+        raise NotImplementedError("JSONRepository is read-only")
+
     def update_game_result(self, game_id: int, failed: bool) -> None:
         """Not supported in read-only JSON mode."""
         raise NotImplementedError("JSONRepository is read-only")
@@ -586,6 +608,7 @@ class JSONRepository(GameRepository):
         rating: float,
         rd: float,
         volatility: float,
+        agent_name: str | None = None,
     ) -> None:
         """Not supported in read-only JSON mode."""
         raise NotImplementedError("JSONRepository is read-only")
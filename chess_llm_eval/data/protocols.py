@@ -1,3 +1,4 @@
+from contextlib import AbstractContextManager
 from typing import Any, Protocol
 
 from chess_llm_eval.data.models import AgentData, AgentRanking, Game, MoveRecord, Puzzle
@@ -19,13 +20,24 @@ class GameRepository(Protocol):
     def save_agent(self, agent: AgentData) -> None: ...
     def get_all_agents(self) -> list[AgentData]: ...
 
+    # Writes made inside a transaction() block are committed together
+    def transaction(self) -> AbstractContextManager[None]: ...
+
     # Game Management
     def create_game(self, puzzle_id: str, agent_name: str) -> int: ...
     def update_game_result(self, game_id: int, failed: bool) -> None: ...
     def save_move(self, game_id: int, move: MoveRecord) -> None: ...
+    def save_moves(self, game_id: int, moves: list[MoveRecord]) -> None: ...
 
     # Benchmarks & Metrics
-    def save_benchmark(self, game_id: int, rating: float, rd: float, volatility: float) -> None: ...
+    def save_benchmark(
+        self,
+        game_id: int,
+        rating: float,
+        rd: float,
+        volatility: float,
+        agent_name: str | None = None,
+    ) -> None: ...
     def get_last_benchmark(self, agent_name: str) -> tuple[float, float, float] | None: ...
     def get_leaderboard(self) -> list[AgentRanking]: ...
     def get_game(self, game_id: int) -> Game | None: ...
@@ -1,98 +1,222 @@
+import contextlib
+import itertools
 import logging
 import os
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from chess_llm_eval.data.models import Puzzle
-from chess_llm_eval.data.sqlite import SQLiteRepository
+from chess_llm_eval.data.sqlite import PUZZLE_COLUMNS, SQLiteRepository
 
 logger = logging.getLogger(__name__)
 
+# Puzzle field -> accepted CSV column names, in order of preference. Lichess exports
+# use the CamelCase headers; our own exports use the field names.
+_COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "id": ("id", "PuzzleId"),
+    "fen": ("fen", "FEN"),
+    "moves": ("moves", "Moves"),
+    "rating": ("rating", "Rating"),
+    "rating_deviation": ("rating_deviation", "RatingDeviation"),
+    "popularity": ("popularity", "Popularity"),
+    "nb_plays": ("nb_plays", "NbPlays"),
+    "themes": ("themes", "Themes"),
+    "game_url": ("game_url", "GameUrl"),
+    "opening_tags": ("opening_tags", "OpeningTags"),
+    "type": ("type",),
+}
+
+# Value used when a column is missing or a cell is empty
+_DEFAULTS: dict[str, Any] = {
+    "id": "",
+    "fen": "",
+    "moves": "",
+    "rating": 1500,
+    "rating_deviation": 350,
+    "popularity": 100,
+    "nb_plays": 100,
+    "themes": "",
+    "game_url": "",
+    "opening_tags": "",
+    "type": "unknown",
+}
+
+# Parse only the columns we map, with fixed types instead of per-chunk inference.
+# Nullable integers keep blank cells as NA until the defaults are filled in, and
+# string ids keep their leading zeros.
+_CSV_DTYPES: dict[str, str] = {
+    alias: "Int64" if isinstance(_DEFAULTS[field], int) else "string"
+    for field, aliases in _COLUMN_ALIASES.items()
+    for alias in aliases
+}
+
+# Rows read per CSV chunk while seeding
+CSV_CHUNK_SIZE = 200_000
+
+# Standard puzzle CSVs and the puzzle type each one holds, in interleave order
+SEED_DATA_DIR = "data"
+STANDARD_CSVS = (
+    ("TacticDB.csv", "tactic"),
+    ("StrategicDB.csv", "strategy"),
+    ("EndGameDB.csv", "endgame"),
+)
+
+
+def _resolve_schema(columns: pd.Index) -> dict[str, str]:
+    """Maps each CSV column to use onto its Puzzle field, picking the preferred alias."""
+    schema = {}
+    for field, aliases in _COLUMN_ALIASES.items():
+        name = next((alias for alias in aliases if alias in columns), None)
+        if name is not None:
+            schema[name] = field
+    return schema
+
 
 class PuzzleSeeder:
     """Helper class to seed the database with puzzles from CSV files."""
 
     def __init__(self, repository: SQLiteRepository) -> None:
         self.repo = repository
+        self.rng = np.random.default_rng()
+
+    def _iter_puzzles_from_csv(self, csv_path: str) -> Iterator[pd.DataFrame]:
+        """Yields the CSV in chunks of at most ``CSV_CHUNK_SIZE`` rows.
 
-    def _get_shuffled_puzzles_from_csv(self, csv_path: str) -> pd.DataFrame:
-        if not os.path.exists(csv_path):
-            logger.warning(f"CSV file not found: {csv_path}")
-            return pd.DataFrame()
-        df = pd.read_csv(csv_path)
-        return df.sample(frac=1).reset_index(drop=True)
+        Columns are renamed to the Puzzle field names, so chunks from CSVs with
+        different header conventions line up when combined.
+        """
+        with pd.read_csv(
+            csv_path,
+            usecols=_CSV_DTYPES.__contains__,
+            dtype=_CSV_DTYPES,
+            chunksize=CSV_CHUNK_SIZE,
+        ) as reader:
+            schema: dict[str, str] | None = None
+            for chunk in reader:
+                if chunk.empty:
+                    continue
+                if schema is None:
+                    schema = _resolve_schema(chunk.columns)
+                yield chunk[list(schema)].rename(columns=schema)
 
-    def _get_val(self, row: pd.Series, names: list[str], default: Any = None) -> Any:
-        for name in names:
-            if name in row:
-                return row[name]
-        return default
+    def _to_rows(self, df: pd.DataFrame) -> Iterator[tuple[Any, ...]]:
+        """Yields one value tuple per puzzle, in ``PUZZLE_COLUMNS`` order.
+
+        Defaults and types are applied per column, so no per-row Python objects
+        beyond the tuples themselves are created.
+        """
+        columns: list[list[Any]] = []
+        for field in PUZZLE_COLUMNS:
+            default = _DEFAULTS[field]
+            if field not in df.columns:
+                columns.append([default] * len(df))
+            elif isinstance(default, int):
+                columns.append(df[field].fillna(default).astype("int64").tolist())
+            else:
+                # Already string dtype from read_csv, so tolist() yields str values
+                columns.append(df[field].fillna(default).tolist())
+
+        return zip(*columns, strict=True)
+
+    def _sample(self, chunk: pd.DataFrame, size: int) -> pd.DataFrame:
+        """Returns ``size`` random rows of ``chunk`` in random order, indexed from 0."""
+        # Gather only the rows we keep rather than shuffling the whole chunk first
+        positions = self.rng.permutation(len(chunk))[:size]
+        return chunk.take(positions).reset_index(drop=True)
 
     def seed_from_standard_paths(self) -> None:
         """
         Seeds the database using the standard tactic, strategy, and endgame CSVs
         if they exist in the 'data' directory.
         """
-        tactic_df = self._get_shuffled_puzzles_from_csv("data/TacticDB.csv")
-        strategy_df = self._get_shuffled_puzzles_from_csv("data/StrategicDB.csv")
-        endgame_df = self._get_shuffled_puzzles_from_csv("data/EndgameDB.csv")
-
-        if tactic_df.empty and strategy_df.empty and endgame_df.empty:
-            logger.info("No puzzle CSVs found to seed.")
-            return
-
-        # Interleave puzzles to ensure balanced categories if limited
-        num_cycles: float | int = min(
-            len(tactic_df) if not tactic_df.empty else float("inf"),
-            len(strategy_df) if not strategy_df.empty else float("inf"),
-            len(endgame_df) if not endgame_df.empty else float("inf"),
-        )
-
-        if num_cycles == float("inf"):
-            # Just take what we have
-            all_puzzles = pd.concat([tactic_df, strategy_df, endgame_df])
-        else:
-            combined_rows = []
-            for i in range(int(num_cycles)):
-                if not tactic_df.empty:
-                    row = tactic_df.iloc[i].copy()
-                    row["type"] = "tactic"
-                    combined_rows.append(row)
-                if not strategy_df.empty:
-                    row = strategy_df.iloc[i].copy()
-                    row["type"] = "strategy"
-                    combined_rows.append(row)
-                if not endgame_df.empty:
-                    row = endgame_df.iloc[i].copy()
-                    row["type"] = "endgame"
-                    combined_rows.append(row)
-            all_puzzles = pd.DataFrame(combined_rows)
-
-        puzzles = []
-        for _, row in all_puzzles.iterrows():
-            # Map CSV columns to Puzzle model
-            # Assuming CSV has: id, fen, moves, rating, rating_deviation,
-            # popularity, nb_plays, themes, game_url, opening_tags
-            # Note: column names might be capitalized in CSV (PuzzleId, FEN, Moves...)
-            # We'll try to find both.
-
-            p = Puzzle(
-                id=str(self._get_val(row, ["id", "PuzzleId"])),
-                fen=str(self._get_val(row, ["fen", "FEN"])),
-                moves=str(self._get_val(row, ["moves", "Moves"])),
-                rating=int(self._get_val(row, ["rating", "Rating"], 1500)),
-                rating_deviation=int(
-                    self._get_val(row, ["rating_deviation", "RatingDeviation"], 350)
-                ),
-                popularity=int(self._get_val(row, ["popularity", "Popularity"], 100)),
-                nb_plays=int(self._get_val(row, ["nb_plays", "NbPlays"], 100)),
-                themes=str(self._get_val(row, ["themes", "Themes"], "")),
-                game_url=str(self._get_val(row, ["game_url", "GameUrl"], "")),
-                opening_tags=str(self._get_val(row, ["opening_tags", "OpeningTags"], "")),
-                type=str(row.get("type", "unknown")),
-            )
-            puzzles.append(p)
-
-        self.repo.save_puzzles(puzzles)
-        logger.info(f"Successfully seeded {len(puzzles)} puzzles to database.")
+        # One directory listing instead of a stat per CSV. Names are matched
+        # case-insensitively, as they would be on macOS and Windows filesystems.
+        try:
+            with os.scandir(SEED_DATA_DIR) as entries:
+                present = {entry.name.lower(): entry.name for entry in entries}
+        except FileNotFoundError:
+            present = {}
+
+        csv_paths: list[tuple[str, str]] = []
+        for file_name, puzzle_type in STANDARD_CSVS:
+            found = present.get(file_name.lower())
+            if found is None:
+                logger.warning(
+                    f"CSV file not found: {os.path.join(SEED_DATA_DIR, file_name)}, "
+                    f"no {puzzle_type} puzzles will be seeded"
+                )
+                continue
+            csv_paths.append((os.path.join(SEED_DATA_DIR, found), puzzle_type))
+
+        # Parsing is mostly GIL-free C code, so one reader thread per CSV overlaps
+        # the parsing of all categories, and of the next round with this round's inserts
+        with ThreadPoolExecutor(max_workers=len(STANDARD_CSVS)) as pool:
+            readers = [self._iter_puzzles_from_csv(csv_path) for csv_path, _ in csv_paths]
+            firsts = list(pool.map(next, readers, itertools.repeat(None)))
+
+            # Missing or empty CSVs are left out of the interleave entirely
+            sources = [
+                (itertools.chain([first], chunks), puzzle_type)
+                for first, chunks, (_, puzzle_type) in zip(firsts, readers, csv_paths, strict=True)
+                if first is not None
+            ]
+            if not sources:
+                logger.info("No puzzle CSVs found to seed.")
+                return
+
+            # Interleave puzzles to ensure balanced categories if limited: each round
+            # takes the same number of random rows from one chunk of every category,
+            # and a stable sort on the row position orders them tactic, strategy,
+            # endgame, ... Seeding stops with the shortest category. Each round is
+            # its own transaction.
+            count = 0
+            with self._bulk_load_pragmas():
+                pending = [pool.submit(next, chunks, None) for chunks, _ in sources]
+                while True:
+                    round_chunks = [
+                        chunk for future in pending if (chunk := future.result()) is not None
+                    ]
+                    if len(round_chunks) < len(pending):
+                        break
+                    pending = [pool.submit(next, chunks, None) for chunks, _ in sources]
+
+                    num_cycles = min(len(chunk) for chunk in round_chunks)
+                    all_puzzles = (
+                        pd.concat(
+                            [
+                                self._sample(chunk, num_cycles).assign(type=puzzle_type)
+                                for chunk, (_, puzzle_type) in zip(
+                                    round_chunks, sources, strict=True
+                                )
+                            ]
+                        )
+                        .sort_index(kind="stable")
+                        .reset_index(drop=True)
+                    )
+                    self.repo.save_puzzle_rows(self._to_rows(all_puzzles))
+                    count += len(all_puzzles)
+
+        logger.info(f"Successfully seeded {count} puzzles to database.")
+
+    @contextlib.contextmanager
+    def _bulk_load_pragmas(self) -> Iterator[None]:
+        """Relaxes durability pragmas for a bulk load and restores them afterwards."""
+        conn = self.repo.conn
+        synchronous = conn.execute("PRAGMA synchronous").fetchone()[0]
+        temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+
+        # Seeding is idempotent (INSERT OR REPLACE) and can simply be re-run, so
+        # skip the extra fsyncs of FULL and keep index-build scratch space in memory
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        try:
+            yield
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute(f"PRAGMA synchronous = {synchronous}")
+            conn.execute(f"PRAGMA temp_store = {temp_store}")
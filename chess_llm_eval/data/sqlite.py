@@ -1,19 +1,94 @@
+from __future__ import annotations
+
 import contextlib
 import logging
 import os
 import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
 from datetime import datetime
-from typing import Any
-
-import pandas as pd
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from chess_llm_eval.data.models import AgentData, AgentRanking, Game, MoveRecord, Puzzle
 
+if TYPE_CHECKING:
+    # pandas is only needed by the reporting queries and is imported in _read_frame,
+    # so opening a repository for puzzles and games doesn't pay its import time
+    import pandas as pd
+
 # We don't inherit from GameRepository at runtime for perf/simplicity, but we match the protocol.
 # Mypy will check the compatibility.
 
 logger = logging.getLogger(__name__)
 
+# Column order of the puzzle value tuples accepted by save_puzzle_rows
+PUZZLE_COLUMNS = (
+    "id",
+    "fen",
+    "moves",
+    "rating",
+    "rating_deviation",
+    "popularity",
+    "nb_plays",
+    "themes",
+    "game_url",
+    "opening_tags",
+    "type",
+)
+
+# Column order of the move rows unpacked by _map_move
+MOVE_COLUMNS = (
+    "id",
+    "game_id",
+    "fen",
+    "correct_move",
+    "move",
+    "prompt_tokens",
+    "completion_tokens",
+    "illegal_move",
+)
+
+# Writers: WAL lets readers proceed during a write and, with synchronous=NORMAL,
+# only fsyncs at checkpoints instead of on every commit. WAL + NORMAL can lose the
+# last commits on power loss but never corrupts the database. Both connection
+# kinds memory-map up to 256 MiB, allow a 64 MiB page cache and keep temp
+# B-trees in RAM.
+WRITE_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -65536;
+"""
+READ_PRAGMAS = """
+    PRAGMA query_only = 1;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -65536;
+"""
+
+# Latest benchmark per agent computed from the benchmark table. Same columns as the
+# latest_benchmark roll-up table; used to fill it and for databases without it.
+LATEST_BENCHMARK_QUERY = """
+    SELECT g.agent_name, b.id AS benchmark_id, b.agent_rating AS rating,
+           b.agent_deviation AS rd, b.agent_volatility AS volatility
+    FROM benchmark b
+    JOIN game g ON b.game_id = g.id
+    WHERE b.id IN (
+        SELECT MAX(b2.id)
+        FROM benchmark b2
+        JOIN game g2 ON b2.game_id = g2.id
+        GROUP BY g2.agent_name
+    )
+"""
+
+# Legal moves in play order, for the group_concat move strings. group_concat joins
+# rows in the order its input arrives, and SQLite before 3.44 has no ORDER BY
+# inside aggregates, so the input is a subquery already sorted by move id. Only
+# the two columns the aggregate needs are materialized.
+LEGAL_MOVES_IN_ORDER = "SELECT game_id, move FROM move WHERE illegal_move = 0 ORDER BY id"
+
 
 class SQLiteRepository:
     """SQLite implementation of GameRepository."""
@@ -21,7 +96,14 @@ class SQLiteRepository:
     def __init__(self, db_path: str = "data/storage.db", immutable: bool = False):
         self.db_path = db_path
         self.immutable = immutable
-
+        # Depth of nested transaction() blocks; only the outermost one commits. The
+        # lock gives one thread at a time the writer connection and the counter.
+        self._transaction_depth = 0
+        self._write_lock = threading.RLock()
+        # Per-thread read-only connections for every read, see _reader()
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
         if immutable:
             # Use immutable mode for read-only filesystems (e.g., Vercel)
             # This skips all locking/journaling for maximum performance
@@ -30,12 +112,40 @@ class SQLiteRepository:
             logger.debug(f"Opening database in immutable mode: {uri}")
             self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
+            self.conn.executescript(READ_PRAGMAS)
+            # SQLite builds without memory-mapped I/O accept the pragma but report 0
+            if not self.conn.execute("PRAGMA mmap_size").fetchone()[0]:
+                logger.warning(
+                    "SQLite memory-mapped I/O is unavailable; immutable reads will use read()"
+                )
             # Skip table creation in immutable mode - database is pre-populated
         else:
             self.conn = sqlite3.connect(db_path, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
+            self.conn.executescript(WRITE_PRAGMAS)
             self._create_tables()
 
+        # Read-only databases built before the roll-up table existed derive it instead
+        has_latest_benchmark = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'latest_benchmark'"
+        ).fetchone()
+        self._latest_benchmark = (
+            "latest_benchmark" if has_latest_benchmark else f"({LATEST_BENCHMARK_QUERY})"
+        )
+        # Agents in _map_agent column order, preferring the latest benchmark rating
+        # over the cached agent columns
+        self._agents_query = f"""
+            SELECT
+                a.name,
+                a.reasoning,
+                a.random,
+                COALESCE(lb.rating, a.rating),
+                COALESCE(lb.rd, a.rd),
+                COALESCE(lb.volatility, a.volatility)
+            FROM agent a
+            LEFT JOIN {self._latest_benchmark} lb ON a.name = lb.agent_name
+        """
+
     def _create_tables(self) -> None:
         cursor = self.conn.cursor()
 
@@ -131,30 +241,163 @@ class SQLiteRepository:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_game_agent_name ON game(agent_name)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_game_puzzle_id ON game(puzzle_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_move_game_id ON move(game_id)")
+        # Latest-game lookups per agent read the games in date order straight from
+        # the index, and the move analytics only need the columns covered here.
+        # benchmark(game_id) is already indexed by its UNIQUE constraint.
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_game_agent_date ON game(agent_name, date DESC, id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_move_game_tokens "
+            "ON move(game_id, illegal_move, prompt_tokens, completion_tokens)"
+        )
+
+        # Latest benchmark per agent, so agent lookups don't scan the benchmark table.
+        # Triggers keep it current for every writer, including backup restores.
+        is_new = not cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'latest_benchmark'"
+        ).fetchone()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS latest_benchmark (
+                agent_name TEXT PRIMARY KEY,
+                benchmark_id INTEGER,
+                rating REAL,
+                rd REAL,
+                volatility REAL
+            )
+        """)
+        if is_new:
+            cursor.execute(f"INSERT INTO latest_benchmark {LATEST_BENCHMARK_QUERY}")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_benchmark_latest_insert
+            AFTER INSERT ON benchmark
+            BEGIN
+                INSERT INTO latest_benchmark (agent_name, benchmark_id, rating, rd, volatility)
+                SELECT agent_name, NEW.id, NEW.agent_rating, NEW.agent_deviation,
+                       NEW.agent_volatility
+                FROM game WHERE id = NEW.game_id
+                ON CONFLICT(agent_name) DO UPDATE SET
+                    benchmark_id = excluded.benchmark_id,
+                    rating = excluded.rating,
+                    rd = excluded.rd,
+                    volatility = excluded.volatility
+                WHERE excluded.benchmark_id > latest_benchmark.benchmark_id;
+            END
+        """)
+        # The agent falls back to its cached rating until its next benchmark
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_benchmark_latest_delete
+            AFTER DELETE ON benchmark
+            BEGIN
+                DELETE FROM latest_benchmark WHERE benchmark_id = OLD.id;
+            END
+        """)
 
         self.conn.commit()
 
+    def _reader(self) -> sqlite3.Connection:
+        """Return this thread's connection for reads.
+
+        Inside this thread's transaction() block that is the writer, so uncommitted
+        writes are visible. Otherwise it is a per-thread read-only connection: under
+        WAL these reads don't wait behind the writer, and threads never share one
+        connection. In-memory databases can't be reopened, so they use ``self.conn``.
+        """
+        if getattr(self._local, "in_transaction", False) or self.db_path in ("", ":memory:"):
+            return self.conn
+
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.immutable:
+                uri = f"file:{os.path.abspath(self.db_path)}?immutable=1"
+            else:
+                uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(READ_PRAGMAS)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close the write connection and every reader opened by ``_reader()``."""
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            conn.close()
+        self._local = threading.local()
+        self.conn.close()
+
+    # --- Transactions ---
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes into a single transaction.
+
+        Every mutator runs in its own block, so mutators called inside an outer
+        block join its transaction. The transaction is committed when the outermost
+        block exits and rolled back if it raises. Blocks on other threads wait until
+        the outermost block has finished.
+        """
+        with self._write_lock:
+            self._transaction_depth += 1
+            self._local.in_transaction = True
+            try:
+                yield
+            except BaseException:
+                if self._transaction_depth == 1:
+                    self.conn.rollback()
+                raise
+            else:
+                if self._transaction_depth == 1:
+                    self.conn.commit()
+            finally:
+                self._transaction_depth -= 1
+                if not self._transaction_depth:
+                    self._local.in_transaction = False
+
     # --- Puzzle Management ---
 
+    def _tuple_cursor(self) -> sqlite3.Cursor:
+        """Return a cursor yielding plain tuples, for rows unpacked by position."""
+        cursor = self._reader().cursor()
+        cursor.row_factory = None
+        return cursor
+
     def get_puzzles(self, limit: int | None = None) -> list[Puzzle]:
-        query = "SELECT * FROM puzzle"
+        query = f"SELECT {', '.join(PUZZLE_COLUMNS)} FROM puzzle"
         params = []
         if limit:
             query += " LIMIT ?"
             params.append(limit)
-        cursor = self.conn.execute(query, tuple(params))
+        cursor = self._tuple_cursor().execute(query, tuple(params))
         return [self._map_puzzle(row) for row in cursor.fetchall()]
 
+    def iter_puzzle_rows(self, batch_size: int = 1000) -> Iterator[dict[str, Any]]:
+        """Yield every puzzle as a plain dict, fetching rows in batches.
+
+        Skips Puzzle construction for bulk consumers such as backups.
+        """
+        cursor = self._tuple_cursor()
+        cursor.arraysize = batch_size
+        cursor.execute(f"SELECT {', '.join(PUZZLE_COLUMNS)} FROM puzzle")
+        while batch := cursor.fetchmany():
+            for row in batch:
+                yield dict(zip(PUZZLE_COLUMNS, row, strict=True))
+
     def get_puzzle(self, puzzle_id: str) -> Puzzle | None:
-        cursor = self.conn.execute("SELECT * FROM puzzle WHERE id = ?", (puzzle_id,))
+        cursor = self._tuple_cursor().execute(
+            f"SELECT {', '.join(PUZZLE_COLUMNS)} FROM puzzle WHERE id = ?", (puzzle_id,)
+        )
         row = cursor.fetchone()
         if not row:
             return None
         return self._map_puzzle(row)
 
     def get_uncompleted_puzzles(self, agent_name: str, limit: int | None = None) -> list[Puzzle]:
-        query = """
-            SELECT p.* FROM puzzle p
+        query = f"""
+            SELECT {", ".join(f"p.{column}" for column in PUZZLE_COLUMNS)} FROM puzzle p
             LEFT JOIN game g ON p.id = g.puzzle_id AND g.agent_name = ?
             WHERE g.id IS NULL
         """
@@ -162,11 +405,11 @@ class SQLiteRepository:
         if limit:
             query += " LIMIT ?"
             params.append(limit)
-        cursor = self.conn.execute(query, tuple(params))
+        cursor = self._tuple_cursor().execute(query, tuple(params))
         return [self._map_puzzle(row) for row in cursor.fetchall()]
 
     def save_puzzles(self, puzzles: list[Puzzle]) -> None:
-        data = [
+        self.save_puzzle_rows(
             (
                 p.id,
                 p.fen,
@@ -181,159 +424,124 @@ class SQLiteRepository:
                 p.type,
             )
             for p in puzzles
-        ]
-        self.conn.executemany(
-            """
-            INSERT OR REPLACE INTO puzzle
-            (id, fen, moves, rating, rating_deviation, popularity, nb_plays,
-             themes, game_url, opening_tags, type)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            data,
         )
-        self.conn.commit()
 
-    def _map_puzzle(self, row: sqlite3.Row) -> Puzzle:
+    def save_puzzle_rows(self, rows: Iterable[tuple[Any, ...]]) -> None:
+        """Insert or replace puzzles given as value tuples, in a single transaction.
+
+        Each tuple holds the values of ``PUZZLE_COLUMNS`` in that order. Lets bulk
+        loaders insert straight from columnar data without building Puzzle objects.
+        """
+        with self.transaction():
+            self.conn.executemany(
+                f"""
+                INSERT OR REPLACE INTO puzzle ({", ".join(PUZZLE_COLUMNS)})
+                VALUES ({", ".join("?" * len(PUZZLE_COLUMNS))})
+            """,
+                rows,
+            )
+
+    def _map_puzzle(self, row: tuple[Any, ...]) -> Puzzle:
+        # Unpacked by position, in PUZZLE_COLUMNS order
+        (
+            puzzle_id,
+            fen,
+            moves,
+            rating,
+            rating_deviation,
+            popularity,
+            nb_plays,
+            themes,
+            game_url,
+            opening_tags,
+            puzzle_type,
+        ) = row
         return Puzzle(
-            id=row["id"],
-            fen=row["fen"],
-            moves=row["moves"],
-            rating=row["rating"],
-            rating_deviation=row["rating_deviation"],
-            popularity=row["popularity"],
-            nb_plays=row["nb_plays"],
-            themes=row["themes"],
-            game_url=row["game_url"],
-            opening_tags=row["opening_tags"],
-            type=row["type"],
+            id=puzzle_id,
+            fen=fen,
+            moves=moves,
+            rating=rating,
+            rating_deviation=rating_deviation,
+            popularity=popularity,
+            nb_plays=nb_plays,
+            themes=themes,
+            game_url=game_url,
+            opening_tags=opening_tags,
+            type=puzzle_type,
         )
 
     # --- Agent Management ---
 
     def get_agent(self, name: str) -> AgentData | None:
-        cursor = self.conn.execute("SELECT * FROM agent WHERE name = ?", (name,))
+        cursor = self._tuple_cursor().execute(f"{self._agents_query} WHERE a.name = ?", (name,))
         row = cursor.fetchone()
         if not row:
             return None
+        return self._map_agent(row)
 
-        # Try to get latest benchmark if columns are not populated or just rely on columns
-        # For robustness, we will trust the columns if we are updating them.
-        # But if we rely on benchmark table, we need a join.
-        # Let's do a join to be safe on existing data without migration.
-
-        # Actually, let's just get the latest benchmark and fill defaults if missing
-        bench_cursor = self.conn.execute(
-            """
-            SELECT b.agent_rating, b.agent_deviation, b.agent_volatility
-            FROM benchmark b
-            JOIN game g ON b.game_id = g.id
-            WHERE g.agent_name = ?
-            ORDER BY g.date DESC LIMIT 1
-        """,
-            (name,),
-        )
-        bench_row = bench_cursor.fetchone()
+    def save_agent(self, agent: AgentData) -> None:
+        with self.transaction():
+            self.conn.execute(
+                """
+                INSERT INTO agent (name, reasoning, random, rating, rd, volatility)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    rating=excluded.rating,
+                    rd=excluded.rd,
+                    volatility=excluded.volatility
+            """,
+                (
+                    agent.name,
+                    agent.is_reasoning,
+                    agent.is_random,
+                    agent.rating,
+                    agent.rd,
+                    agent.volatility,
+                ),
+            )
 
-        rating = bench_row["agent_rating"] if bench_row else row["rating"]
-        rd = bench_row["agent_deviation"] if bench_row else row["rd"]
-        vol = bench_row["agent_volatility"] if bench_row else row["volatility"]
+    def get_all_agents(self) -> list[AgentData]:
+        # Fetch all agents in one go with their latest benchmark stats
+        cursor = self._tuple_cursor().execute(self._agents_query)
+        return [self._map_agent(row) for row in cursor.fetchall()]
 
+    def _map_agent(self, row: tuple[Any, ...]) -> AgentData:
+        # Unpacked by position; ratings missing from both sources fall back to defaults
+        name, reasoning, random, rating, rd, vol = row
         return AgentData(
-            name=row["name"],
-            is_reasoning=bool(row["reasoning"]),
-            is_random=bool(row["random"]),
+            name=name,
+            is_reasoning=bool(reasoning),
+            is_random=bool(random),
             rating=float(rating) if rating is not None else 1500.0,
             rd=float(rd) if rd is not None else 350.0,
             volatility=float(vol) if vol is not None else 0.06,
         )
 
-    def save_agent(self, agent: AgentData) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO agent (name, reasoning, random, rating, rd, volatility)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(name) DO UPDATE SET
-                rating=excluded.rating,
-                rd=excluded.rd,
-                volatility=excluded.volatility
-        """,
-            (
-                agent.name,
-                agent.is_reasoning,
-                agent.is_random,
-                agent.rating,
-                agent.rd,
-                agent.volatility,
-            ),
-        )
-        self.conn.commit()
-
-    def get_all_agents(self) -> list[AgentData]:
-        # Fetch all agents in one go with their latest benchmark stats
-        query = """
-            SELECT
-                a.*,
-                b.agent_rating as last_rating,
-                b.agent_deviation as last_rd,
-                b.agent_volatility as last_vol
-            FROM agent a
-            LEFT JOIN (
-                SELECT g.agent_name, b.*
-                FROM benchmark b
-                JOIN game g ON b.game_id = g.id
-                WHERE b.id IN (
-                    SELECT MAX(b2.id)
-                    FROM benchmark b2
-                    JOIN game g2 ON b2.game_id = g2.id
-                    GROUP BY g2.agent_name
-                )
-            ) b ON a.name = b.agent_name
-        """
-        cursor = self.conn.execute(query)
-        agents = []
-        for row in cursor.fetchall():
-            rating = row["last_rating"] if row["last_rating"] is not None else row["rating"]
-            rd = row["last_rd"] if row["last_rd"] is not None else row["rd"]
-            vol = row["last_vol"] if row["last_vol"] is not None else row["volatility"]
-
-            agents.append(
-                AgentData(
-                    name=row["name"],
-                    is_reasoning=bool(row["reasoning"]),
-                    is_random=bool(row["random"]),
-                    rating=float(rating) if rating is not None else 1500.0,
-                    rd=float(rd) if rd is not None else 350.0,
-                    volatility=float(vol) if vol is not None else 0.06,
-                )
-            )
-        return agents
-
     # --- Game Management ---
 
     def create_game(self, puzzle_id: str, agent_name: str) -> int:
-        cursor = self.conn.execute(
-            "INSERT INTO game (puzzle_id, agent_name, failed) VALUES (?, ?, ?)",
-            (
-                puzzle_id,
-                agent_name,
-                False,
-            ),  # Assume success initially? NO, failed=False means "not failed yet".
-        )
-        self.conn.commit()
-        return cursor.lastrowid or 0
+        with self.transaction():
+            # RETURNING hands back the new id from the insert itself (SQLite 3.35+)
+            (game_id,) = self.conn.execute(
+                "INSERT INTO game (puzzle_id, agent_name, failed) VALUES (?, ?, ?) RETURNING id",
+                (
+                    puzzle_id,
+                    agent_name,
+                    False,
+                ),  # Assume success initially? NO, failed=False means "not failed yet".
+            ).fetchone()
+        return int(game_id)
 
     def update_game_result(self, game_id: int, failed: bool) -> None:
-        self.conn.execute("UPDATE game SET failed = ? WHERE id = ?", (failed, game_id))
-        self.conn.commit()
+        with self.transaction():
+            self.conn.execute("UPDATE game SET failed = ? WHERE id = ?", (failed, game_id))
 
     def save_move(self, game_id: int, move: MoveRecord) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO move (
-                game_id, fen, correct_move, move, prompt_tokens, completion_tokens, illegal_move
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
+        self.save_moves(game_id, [move])
+
+    def save_moves(self, game_id: int, moves: list[MoveRecord]) -> None:
+        """Insert all moves of a game in a single transaction."""
+        data = [
             (
                 game_id,
                 move.fen,
@@ -342,34 +550,59 @@ class SQLiteRepository:
                 move.prompt_tokens,
                 move.completion_tokens,
                 move.is_illegal,
-            ),
-        )
-        self.conn.commit()
+            )
+            for move in moves
+        ]
+        with self.transaction():
+            self.conn.executemany(
+                """
+                INSERT INTO move (
+                    game_id, fen, correct_move, move, prompt_tokens, completion_tokens, illegal_move
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                data,
+            )
 
     # --- Benchmarks ---
 
-    def save_benchmark(self, game_id: int, rating: float, rd: float, volatility: float) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO benchmark (game_id, agent_rating, agent_deviation, agent_volatility)
-            VALUES (?, ?, ?, ?)
-        """,
-            (game_id, rating, rd, volatility),
-        )
+    def save_benchmark(
+        self,
+        game_id: int,
+        rating: float,
+        rd: float,
+        volatility: float,
+        agent_name: str | None = None,
+    ) -> None:
+        """Record a rating update and refresh the agent's cached rating.
+
+        Callers that know the game's agent should pass ``agent_name`` so the cache
+        update doesn't have to look it up from the game.
+        """
+        with self.transaction():
+            self.conn.execute(
+                """
+                INSERT INTO benchmark (game_id, agent_rating, agent_deviation, agent_volatility)
+                VALUES (?, ?, ?, ?)
+            """,
+                (game_id, rating, rd, volatility),
+            )
 
-        # Also update agent table cache
-        # We need agent name. We can get it from game_id via join or just trust caller.
-        # But helper method is better.
-        # Let's just do a subquery or separate update.
-        self.conn.execute(
-            """
-            UPDATE agent
-            SET rating=?, rd=?, volatility=?
-            WHERE name = (SELECT agent_name FROM game WHERE id=?)
-        """,
-            (rating, rd, volatility, game_id),
-        )
-        self.conn.commit()
+            # Also update agent table cache
+            if agent_name is not None:
+                self.conn.execute(
+                    "UPDATE agent SET rating=?, rd=?, volatility=? WHERE name=?",
+                    (rating, rd, volatility, agent_name),
+                )
+            else:
+                self.conn.execute(
+                    """
+                    UPDATE agent
+                    SET rating=?, rd=?, volatility=?
+                    WHERE name = (SELECT agent_name FROM game WHERE id=?)
+                """,
+                    (rating, rd, volatility, game_id),
+                )
 
     def get_last_benchmark(self, agent_name: str) -> tuple[float, float, float] | None:
         # Redundant if get_agent does this, but good for protocol
@@ -390,8 +623,9 @@ class SQLiteRepository:
             FROM agent a
             LEFT JOIN game g ON a.name = g.agent_name
             GROUP BY a.name
+            ORDER BY a.rating DESC, a.name
         """
-        cursor = self.conn.execute(query)
+        cursor = self._reader().execute(query)
         rankings = []
 
         for row in cursor.fetchall():
@@ -409,13 +643,12 @@ class SQLiteRepository:
                 )
             )
 
-        rankings.sort(key=lambda x: x.rating, reverse=True)
         return rankings
 
     def get_game(self, game_id: int) -> Game | None:
-        cursor = self.conn.execute(
+        cursor = self._tuple_cursor().execute(
             """
-            SELECT g.*, p.type as puzzle_type
+            SELECT g.id, g.puzzle_id, p.type, g.agent_name, g.failed, g.date
             FROM game g
             JOIN puzzle p ON g.puzzle_id = p.id
             WHERE g.id = ?
@@ -427,34 +660,18 @@ class SQLiteRepository:
             return None
 
         # Get moves
-        move_cursor = self.conn.execute(
-            "SELECT * FROM move WHERE game_id = ? ORDER BY id", (game_id,)
+        move_cursor = self._tuple_cursor().execute(
+            f"SELECT {', '.join(MOVE_COLUMNS)} FROM move WHERE game_id = ? ORDER BY id",
+            (game_id,),
         )
         moves = [self._map_move(m) for m in move_cursor.fetchall()]
-
-        date_str = row["date"].replace(" ", "T") if row["date"] else datetime.now().isoformat()
-        try:
-            date_obj = datetime.fromisoformat(date_str)
-        except ValueError:
-            # Fallback if format is unexpected
-            date_obj = datetime.now()
-
-        return Game(
-            id=row["id"],
-            puzzle_id=row["puzzle_id"],
-            puzzle_type=row["puzzle_type"],
-            agent_name=row["agent_name"],
-            failed=bool(row["failed"]),
-            date=date_obj,
-            moves=moves,
-            move_count=len(moves),
-        )
+        return self._map_game(row, moves, len(moves))
 
     def get_agent_games(self, agent_name: str) -> list[Game]:
         # Efficiently fetch games and move counts without loading all moves
-        cursor = self.conn.execute(
+        cursor = self._tuple_cursor().execute(
             """
-            SELECT g.*, p.type as puzzle_type, COUNT(m.id) as move_count
+            SELECT g.id, g.puzzle_id, p.type, g.agent_name, g.failed, g.date, COUNT(m.id)
             FROM game g
             JOIN puzzle p ON g.puzzle_id = p.id
             LEFT JOIN move m ON g.id = m.game_id
@@ -464,43 +681,74 @@ class SQLiteRepository:
         """,
             (agent_name,),
         )
+        # Don't load moves for summary list
+        return [self._map_game(row[:6], [], row[6]) for row in cursor.fetchall()]
 
-        games = []
-        for row in cursor.fetchall():
-            date_str = row["date"].replace(" ", "T") if row["date"] else datetime.now().isoformat()
-            try:
-                date_obj = datetime.fromisoformat(date_str)
-            except ValueError:
-                date_obj = datetime.now()
-
-            games.append(
-                Game(
-                    id=row["id"],
-                    puzzle_id=row["puzzle_id"],
-                    puzzle_type=row["puzzle_type"],
-                    agent_name=row["agent_name"],
-                    failed=bool(row["failed"]),
-                    date=date_obj,
-                    moves=[],  # Don't load moves for summary list
-                    move_count=row["move_count"],
-                )
-            )
-        return games
+    def _map_game(self, row: tuple[Any, ...], moves: list[MoveRecord], move_count: int) -> Game:
+        game_id, puzzle_id, puzzle_type, agent_name, failed, date = row
+        # fromisoformat is C-implemented and accepts SQLite's space-separated
+        # CURRENT_TIMESTAMP text as is, so dates are parsed straight from the column
+        try:
+            date_obj = datetime.fromisoformat(date) if date else datetime.now()
+        except ValueError:
+            # Fallback if format is unexpected
+            date_obj = datetime.now()
 
-    def _map_move(self, row: sqlite3.Row) -> MoveRecord:
+        return Game(
+            id=game_id,
+            puzzle_id=puzzle_id,
+            puzzle_type=puzzle_type,
+            agent_name=agent_name,
+            failed=bool(failed),
+            date=date_obj,
+            moves=moves,
+            move_count=move_count,
+        )
+
+    def _map_move(self, row: tuple[Any, ...]) -> MoveRecord:
+        # Unpacked by position, in MOVE_COLUMNS order
+        (
+            move_id,
+            game_id,
+            fen,
+            correct_move,
+            move,
+            prompt_tokens,
+            completion_tokens,
+            illegal_move,
+        ) = row
         return MoveRecord(
-            id=row["id"],
-            game_id=row["game_id"],
-            fen=row["fen"],
-            expected_move=row["correct_move"],
-            actual_move=row["move"],
-            is_illegal=bool(row["illegal_move"]),
-            prompt_tokens=row["prompt_tokens"] or 0,
-            completion_tokens=row["completion_tokens"] or 0,
+            id=move_id,
+            game_id=game_id,
+            fen=fen,
+            expected_move=correct_move,
+            actual_move=move,
+            is_illegal=bool(illegal_move),
+            prompt_tokens=prompt_tokens or 0,
+            completion_tokens=completion_tokens or 0,
         )
 
     # --- Reporting / Analysis Methods (returning Pandas DataFrames) ---
 
+    def _read_frame(self, query: str, parse_dates: list[str] | None = None) -> pd.DataFrame:
+        """Run a reporting query on this thread's reader into a DataFrame.
+
+        Equivalent to ``pd.read_sql_query`` but fetches plain tuples, so no
+        ``sqlite3.Row`` is built per result row only to be unpacked again.
+        """
+        import pandas as pd
+
+        cursor = self._reader().cursor()
+        cursor.row_factory = None
+        cursor.execute(query)
+        columns = [description[0] for description in cursor.description]
+        df: pd.DataFrame = pd.DataFrame.from_records(
+            cursor.fetchall(), columns=columns, coerce_float=True
+        )
+        for column in parse_dates or []:
+            df[column] = pd.to_datetime(df[column])
+        return df
+
     def get_benchmark_data(self) -> pd.DataFrame:
         """
         Get all benchmark data from the database ordered by date.
@@ -519,7 +767,7 @@ class SQLiteRepository:
             LEFT JOIN game g ON g.id = b.game_id
             ORDER BY b.id
         """
-        return pd.read_sql_query(query, self.conn, parse_dates=["date"])
+        return self._read_frame(query, parse_dates=["date"])
 
     def get_puzzle_outcome_data(self) -> pd.DataFrame:
         """
@@ -550,7 +798,7 @@ class SQLiteRepository:
             JOIN puzzle p ON g.puzzle_id = p.id
             GROUP BY {group_cols}
         """
-        return pd.read_sql_query(query, self.conn)
+        return self._read_frame(query)
 
     def get_illegal_moves_data(self) -> pd.DataFrame:
         """
@@ -569,7 +817,7 @@ class SQLiteRepository:
             WHERE a.random = 0
             GROUP BY a.name
         """
-        return pd.read_sql_query(query, self.conn)
+        return self._read_frame(query)
 
     def get_final_ratings_data(self) -> pd.DataFrame:
         """
@@ -585,40 +833,59 @@ class SQLiteRepository:
                 rd AS agent_deviation
             FROM agent
         """
-        return pd.read_sql_query(query, self.conn)
+        return self._read_frame(query)
 
     def get_weighted_puzzle_rating(self) -> tuple[float | None, float | None]:
         """
         Calculate the weighted average rating and rating deviation from the puzzles table.
-        Returns a tuple (weighted_rating, weighted_rd).
-        """
-        cursor = self.conn.execute("""
+        Returns a tuple (weighted_rating, weighted_rd). Cached per thread until the
+        database changes.
+        """
+        # Uncommitted writes are only visible on the writer connection
+        if getattr(self._local, "in_transaction", False):
+            return self._query_weighted_puzzle_rating(self.conn)
+
+        # data_version changes when any other connection or process commits, and
+        # total_changes when this repository's writer does
+        reader = self._reader()
+        version = (reader.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes)
+        cached = getattr(self._local, "weighted_puzzle_rating", None)
+        if cached is not None and cached[0] == version:
+            rating: tuple[float | None, float | None] = cached[1]
+            return rating
+
+        rating = self._query_weighted_puzzle_rating(reader)
+        self._local.weighted_puzzle_rating = (version, rating)
+        return rating
+
+    @staticmethod
+    def _query_weighted_puzzle_rating(
+        conn: sqlite3.Connection,
+    ) -> tuple[float | None, float | None]:
+        row = conn.execute("""
             SELECT
                 SUM(rating * popularity) * 1.0 / SUM(popularity) as weighted_rating,
                 SUM(rating_deviation * popularity) * 1.0 / SUM(popularity) as weighted_rd
             FROM puzzle
             WHERE rating IS NOT NULL AND rating_deviation IS NOT NULL AND popularity > 0
-        """)
-        row = cursor.fetchone()
-        if row and row["weighted_rating"] is not None:
-            return row["weighted_rating"], row["weighted_rd"]
-        else:
-            return None, None
+        """).fetchone()
+        if row and row[0] is not None:
+            return (row[0], row[1])
+        return (None, None)
 
     def get_solutionary_agent_moves(self) -> pd.DataFrame:
         """
         Retrieve the puzzle solutionary moves and corresponding legal moves for each agent.
         Returns columns: agent_name, moves, agent_moves.
         """
-        query = """
+        query = f"""
             SELECT g.agent_name, p.moves, group_concat(m.move, ' ') as agent_moves
-            FROM game g
+            FROM ({LEGAL_MOVES_IN_ORDER}) m
+            JOIN game g ON g.id = m.game_id
             JOIN puzzle p ON g.puzzle_id = p.id
-            LEFT JOIN (SELECT * FROM move ORDER BY id) m ON m.game_id = g.id
-            WHERE m.illegal_move = 0
             GROUP BY g.id
         """
-        return pd.read_sql_query(query, self.conn)
+        return self._read_frame(query)
 
     def get_token_usage_per_move_data(self) -> pd.DataFrame:
         """
@@ -636,7 +903,7 @@ class SQLiteRepository:
             GROUP BY g.agent_name
             HAVING AVG(m.prompt_tokens) > 0 AND AVG(m.completion_tokens) > 0
         """
-        return pd.read_sql_query(query, self.conn)
+        return self._read_frame(query)
 
     def get_token_usage_per_puzzle_data(self) -> pd.DataFrame:
         """
@@ -661,7 +928,7 @@ class SQLiteRepository:
             GROUP BY agent_name
             HAVING AVG(total_prompt) > 0 AND AVG(total_completion) > 0
         """
-        return pd.read_sql_query(query, self.conn)
+        return self._read_frame(query)
 
     def get_solutionary_moves_data(self) -> pd.DataFrame:
         """
@@ -670,7 +937,7 @@ class SQLiteRepository:
         Returns columns: agent_name, themes, puzzle_rating,
         puzzle_deviation, moves, agent_moves.
         """
-        query = """
+        query = f"""
             SELECT
                 g.agent_name,
                 p.type,
@@ -678,10 +945,9 @@ class SQLiteRepository:
                 p.rating_deviation as puzzle_deviation,
                 p.moves,
                 group_concat(m.move, ' ') as agent_moves
-            FROM game g
+            FROM ({LEGAL_MOVES_IN_ORDER}) m
+            JOIN game g ON g.id = m.game_id
             JOIN puzzle p ON g.puzzle_id = p.id
-            LEFT JOIN (SELECT * FROM move ORDER BY id) m ON m.game_id = g.id
-            WHERE m.illegal_move = 0
             GROUP BY g.id
         """
-        return pd.read_sql_query(query, self.conn)
+        return self._read_frame(query)
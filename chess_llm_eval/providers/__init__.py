@@ -1,5 +1,6 @@
 from .base import LLMProvider
+from .cache import CachedProvider
 from .nim import NIMProvider
 from .openrouter import OpenRouterProvider
 
-__all__ = ["LLMProvider", "NIMProvider", "OpenRouterProvider"]
+__all__ = ["CachedProvider", "LLMProvider", "NIMProvider", "OpenRouterProvider"]
@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from chess_llm_eval.providers.base import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+
+class CachedProvider:  # Implements LLMProvider via Protocol
+    """LLMProvider wrapper that persists responses in SQLite, keyed by the full request.
+
+    A request with the same model, messages, sampling settings and extra arguments as an
+    earlier successful one is answered from the cache without an API call. Hits return
+    the token counts recorded with the original response, so token-usage reports stay
+    comparable with uncached runs.
+
+    Caching freezes one sample per request: at a non-zero temperature, a repeated
+    position no longer shows the model's sampling variance. Use it for re-runs and
+    development rather than for measuring how consistent a model is.
+    """
+
+    def __init__(self, provider: LLMProvider, db_path: str = "data/llm_cache.db") -> None:
+        self.provider = provider
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS response (
+                key TEXT PRIMARY KEY,
+                content TEXT,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                created REAL
+            )
+        """)
+        self.conn.commit()
+        # Cache I/O runs in worker threads, which must not share the connection at once
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(
+        messages: list[dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int | None,
+        kwargs: dict[str, Any],
+    ) -> str:
+        request = {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "messages": messages,
+            "kwargs": kwargs,
+        }
+        encoded = json.dumps(request, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _get(self, key: str) -> tuple[str, int, int] | None:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT content, prompt_tokens, completion_tokens FROM response WHERE key = ?",
+                (key,),
+            ).fetchone()
+        return (row[0], row[1], row[2]) if row else None
+
+    def _put(self, key: str, response: tuple[str, int, int]) -> None:
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO response VALUES (?, ?, ?, ?, ?)",
+                (key, *response, time.time()),
+            )
+
+    async def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str,
+        temperature: float = 0.0,
+        max_tokens: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[str, int, int]:
+        """
+        Answer from the cache, or send the request and cache a successful response.
+        """
+        key = self._key(messages, model, temperature, max_tokens, kwargs)
+        cached = await asyncio.to_thread(self._get, key)
+        if cached is not None:
+            logger.debug(f"Cache hit for {model}")
+            return cached
+
+        response = await self.provider.complete(
+            messages, model=model, temperature=temperature, max_tokens=max_tokens, **kwargs
+        )
+        await asyncio.to_thread(self._put, key, response)
+        return response
+
+    async def close(self) -> None:
+        """Close the cache database and the wrapped provider."""
+        self.conn.close()
+        # LLMProvider doesn't require close(); only close providers that hold connections
+        close = getattr(self.provider, "close", None)
+        if close is not None:
+            await close()
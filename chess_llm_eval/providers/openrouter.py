@@ -1,8 +1,6 @@
-import asyncio
 import logging
-import random
+import time
 import traceback
-from datetime import datetime
 from typing import Any, cast
 
 from aiolimiter import AsyncLimiter
@@ -38,14 +36,11 @@ class OpenRouterProvider:  # Implements LLMProvider via Protocol
         """
         Send a completion request to the LLM.
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         logger.debug(f"Waiting for rate limiter ({self.max_rpm} rpm)")
 
         try:
             async with self._super_limiter:
-                # Reduced sleep for efficiency, but kept to smooth out bursts
-                await asyncio.sleep(random.uniform(0, 0.5))
-
                 # Prepare extra_body for OpenRouter specific features
                 extra_body = kwargs.get("extra_body", {})
                 if "include_usage" not in extra_body:
@@ -65,7 +60,7 @@ class OpenRouterProvider:  # Implements LLMProvider via Protocol
                 )
                 completion = cast(ChatCompletion, completion)
 
-            elapsed = (datetime.now() - start_time).total_seconds()
+            elapsed = time.perf_counter() - start_time
             logger.debug(f"Received response for {model} in {elapsed:.2f}s")
 
             if not completion or not completion.choices:
@@ -84,3 +79,7 @@ class OpenRouterProvider:  # Implements LLMProvider via Protocol
             logger.error(f"Error during API request for model {model}: {e}")
             logger.debug(traceback.format_exc())
             raise
+
+    async def close(self) -> None:
+        """Close the pooled HTTP connections of the underlying client."""
+        await self.client.close()
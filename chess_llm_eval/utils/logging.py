@@ -1,12 +1,18 @@
+import atexit
 import logging
 import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 
 def setup_logging(log_level: int = logging.INFO) -> logging.Logger:
     """
     Configure logging for the chess-llm evaluation library.
     Creates a 'logs' directory and adds both file and stream handlers.
+
+    The handlers run on a background QueueListener thread, so log calls made on the
+    event loop only format and enqueue the record instead of writing to disk.
     """
     log_dir = os.path.join(os.getcwd(), "logs")
     os.makedirs(log_dir, exist_ok=True)
@@ -14,12 +20,23 @@ def setup_logging(log_level: int = logging.INFO) -> logging.Logger:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_file = os.path.join(log_dir, f"chess_eval_{timestamp}.log")
 
+    # The QueueHandler formats each record before enqueueing it, so the listener's
+    # handlers keep the default formatter and write the message as is
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
     logging.basicConfig(
         level=log_level,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.FileHandler(log_file), logging.StreamHandler()],
+        handlers=[queue_handler],
     )
 
+    # basicConfig leaves an already configured root logger alone
+    if queue_handler in logging.getLogger().handlers:
+        listener = QueueListener(log_queue, logging.FileHandler(log_file), logging.StreamHandler())
+        listener.start()
+        # Stopping drains the queue, so records logged right before exit are kept
+        atexit.register(listener.stop)
+
     # Mute noisy loggers
     logging.getLogger("aiohttp").setLevel(logging.WARNING)
     logging.getLogger("matplotlib").setLevel(logging.WARNING)
@@ -73,10 +73,13 @@ async def main() -> None:
         evaluator = Evaluator(agent, puzzles, repo)
         evaluators.append(evaluator)
 
-    if evaluators:
-        await asyncio.gather(*[evaluator.evaluate_all() for evaluator in evaluators])
-    else:
-        logging.info("No evaluations to run.")
+    try:
+        if evaluators:
+            await asyncio.gather(*[evaluator.evaluate_all() for evaluator in evaluators])
+        else:
+            logging.info("No evaluations to run.")
+    finally:
+        await provider.close()
 
 
 if __name__ == "__main__":
@@ -7,7 +7,9 @@ logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("backup_db")
 
 
-def run_backup(json_path: str | None = None, dump_path: str | None = None) -> None:
+def run_backup(
+    json_path: str | None = None, dump_path: str | None = None, sql_text: bool = False
+) -> None:
     backup = FullDatabaseBackup("data/storage.db")
 
     logger.info("Starting Full Database Backup...")
@@ -16,8 +18,8 @@ def run_backup(json_path: str | None = None, dump_path: str | None = None) -> No
     final_json = backup.export_all_to_json(json_path)
     logger.info(f"JSON Backup successful: {final_json}")
 
-    # SQLite Dump
-    final_dump = backup.sqlite_dump(dump_path)
+    # SQLite snapshot (binary copy, or SQL text with --sql)
+    final_dump = backup.sqlite_dump(dump_path, sql_text=sql_text)
     logger.info(f"SQLite Dump successful: {final_dump}")
 
     # Simple verification
@@ -31,7 +33,10 @@ def run_backup(json_path: str | None = None, dump_path: str | None = None) -> No
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Backup the Chess-LLM Arena database.")
     parser.add_argument("--json", help="Path to save JSON backup")
-    parser.add_argument("--dump", help="Path to save SQL dump")
+    parser.add_argument("--dump", help="Path to save the SQLite snapshot")
+    parser.add_argument(
+        "--sql", action="store_true", help="Write a SQL text dump instead of a binary copy"
+    )
 
     args = parser.parse_args()
-    run_backup(args.json, args.dump)
+    run_backup(args.json, args.dump, args.sql)
@@ -1,3 +1,4 @@
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
@@ -66,6 +67,9 @@ class MockRepository(GameRepository):
     def get_all_agents(self) -> list[AgentData]:
         return list(self.agents.values())
 
+    def transaction(self) -> AbstractContextManager[None]:
+        return nullcontext()
+
     def create_game(self, puzzle_id: str, agent_name: str) -> int:
         game_id = len(self.games) + 1
         self.games[game_id] = {"puzzle_id": puzzle_id, "agent_name": agent_name, "failed": False}
@@ -80,7 +84,17 @@ class MockRepository(GameRepository):
             self.moves[game_id] = []
         self.moves[game_id].append(move)
 
-    def save_benchmark(self, game_id: int, rating: float, rd: float, volatility: float) -> None:
+    def save_moves(self, game_id: int, moves: list[MoveRecord]) -> None:
+        self.moves.setdefault(game_id, []).extend(moves)
+
+    def save_benchmark(
+        self,
+        game_id: int,
+        rating: float,
+        rd: float,
+        volatility: float,
+        agent_name: str | None = None,
+    ) -> None:
         self.benchmarks.append(
             {"game_id": game_id, "rating": rating, "rd": rd, "volatility": volatility}
         )
@@ -72,6 +72,26 @@ async def test_llm_agent_get_move_success(llm_agent: LLMAgent, mock_provider: As
     assert ct == 5
 
 
+@pytest.mark.asyncio
+async def test_llm_agent_get_move_strips_punctuation(
+    llm_agent: LLMAgent, mock_provider: AsyncMock
+) -> None:
+    """
+    Test that dots and stray whitespace are removed from the parsed move.
+    Why: Models often echo PGN-style output such as "e4." or "N f3". The cleaned string is what
+    gets checked for legality, so leftover dots or spaces would cause false illegal moves.
+    """
+    mock_provider.complete.return_value = ("<FinalMove> e4.\n</FinalMove>", 10, 5)
+    result = await llm_agent.get_move("fen", ["e4"], "white")
+    assert result is not None
+    assert result[0] == "e4"
+
+    mock_provider.complete.return_value = ("<finalmove>N f3</finalmove>", 10, 5)
+    result = await llm_agent.get_move("fen", ["Nf3"], "white")
+    assert result is not None
+    assert result[0] == "Nf3"
+
+
 @pytest.mark.asyncio
 async def test_llm_agent_get_move_parse_failure(
     llm_agent: LLMAgent, mock_provider: AsyncMock
@@ -103,3 +123,30 @@ async def test_llm_agent_retry_move(llm_agent: LLMAgent, mock_provider: AsyncMoc
     # Check that messages include the failure
     messages = mock_provider.complete.call_args[0][0]
     assert any("e4 is illegal" in m["content"] for m in messages)
+
+
+@pytest.mark.asyncio
+async def test_llm_agent_retry_move_extends_history(
+    llm_agent: LLMAgent, mock_provider: AsyncMock
+) -> None:
+    """
+    Test that consecutive retries on one position send the full, ordered failure history.
+    Why: Retry conversations are extended from the previous attempt rather than rebuilt.
+    Each request must contain every earlier failure exactly once, earlier requests must
+    not change afterwards, and a legal answer must end the conversation.
+    """
+    mock_provider.complete.return_value = ("<FinalMove>Ke2</FinalMove>", 15, 8)
+    await llm_agent.retry_move(["e5"], "fen", ["e4", "d4"], "white")
+    first = mock_provider.complete.call_args[0][0]
+
+    mock_provider.complete.return_value = ("<FinalMove>d4</FinalMove>", 15, 8)
+    await llm_agent.retry_move(["e5", "Ke2"], "fen", ["e4", "d4"], "white")
+    messages = mock_provider.complete.call_args[0][0]
+
+    assert [m["content"] for m in messages if m["role"] == "assistant"] == [
+        "<FinalMove>e5</FinalMove>",
+        "<FinalMove>Ke2</FinalMove>",
+    ]
+    assert len(messages) == 6  # system + user + 2 x (assistant, feedback)
+    assert len(first) == 4
+    assert llm_agent._retry_histories == {}
@@ -0,0 +1,60 @@
+import asyncio
+import sys
+import threading
+import time
+from typing import Any
+
+import chess
+import chess.engine
+import pytest
+
+from chess_llm_eval.agents.stockfish import StockfishAgent
+
+
+class FakeEngine:
+    """Stands in for SimpleEngine and records whether two commands ever overlapped."""
+
+    def __init__(self) -> None:
+        self._guard = threading.Lock()
+        self.active = 0
+        self.overlapped = False
+
+    def configure(self, options: dict[str, Any]) -> None:
+        pass
+
+    def play(self, board: chess.Board, limit: chess.engine.Limit) -> chess.engine.PlayResult:
+        with self._guard:
+            self.active += 1
+            self.overlapped |= self.active > 1
+        time.sleep(0.01)
+        with self._guard:
+            self.active -= 1
+        return chess.engine.PlayResult(next(iter(board.legal_moves)), None)
+
+    def quit(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_engine(monkeypatch: pytest.MonkeyPatch) -> FakeEngine:
+    engine = FakeEngine()
+    monkeypatch.setenv("STOCKFISH_PATH", sys.executable)
+    monkeypatch.setattr(chess.engine.SimpleEngine, "popen_uci", lambda path: engine)
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_stockfish_concurrent_get_move_is_serialized(fake_engine: FakeEngine) -> None:
+    """
+    Test that concurrent get_move calls never overlap on the shared engine.
+    Why: SimpleEngine cancels the in-flight command when another arrives, so puzzles
+    evaluated concurrently by the worker pool must not drive the engine at the same time.
+    """
+    agent = StockfishAgent(level=1)
+
+    results = await asyncio.gather(
+        *(agent.get_move(chess.STARTING_FEN, [], "white") for _ in range(8))
+    )
+
+    assert not fake_engine.overlapped
+    assert all(result is not None for result in results)
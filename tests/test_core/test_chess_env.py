@@ -1,3 +1,4 @@
+import chess
 import pytest
 
 from chess_llm_eval.core.chess_env import ChessEnv
@@ -62,6 +63,19 @@ def test_chess_env_is_move_legal() -> None:
     assert env.is_move_legal("InvalidMove") is False
 
 
+def test_chess_env_is_move_legal_requires_exact_san() -> None:
+    """
+    Test that legality checks only accept canonical SAN strings.
+    Why: The accepted string is stored and compared against the expected solution move.
+    Lenient spellings that python-chess can parse (long algebraic, null moves) must be
+    rejected so the agent is asked to retry instead of being scored on a non-SAN move.
+    """
+    env = ChessEnv("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    assert env.is_move_legal("Nf3") is True
+    assert env.is_move_legal("Ng1f3") is False
+    assert env.is_move_legal("--") is False
+
+
 def test_chess_env_apply_move() -> None:
     """
     Test applying a move to update the board state.
@@ -74,6 +88,21 @@ def test_chess_env_apply_move() -> None:
     assert env.get_turn_color() == "black"
 
 
+def test_chess_env_push_move() -> None:
+    """
+    Test applying a pre-parsed chess.Move to the board.
+    Why: The evaluator parses puzzle solutions once and pushes Move objects directly.
+    Illegal moves must still be rejected rather than silently corrupting the board.
+    """
+    env = ChessEnv("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    assert env.get_legal_moves()  # Populate the legal move cache
+    env.push_move(chess.Move.from_uci("e2e4"))
+    assert env.get_turn_color() == "black"
+    assert "e5" in env.get_legal_moves()
+    with pytest.raises(ValueError, match="Illegal or invalid move"):
+        env.push_move(chess.Move.from_uci("e2e4"))
+
+
 def test_chess_env_uci_to_san() -> None:
     """
     Test conversion from UCI to SAN notation.
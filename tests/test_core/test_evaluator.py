@@ -1,3 +1,5 @@
+import asyncio
+from dataclasses import replace
 from unittest.mock import MagicMock
 
 import pytest
@@ -55,6 +57,62 @@ async def test_evaluator_evaluate_puzzle_illegal_move_retry(
     assert len(mock_repo.moves[1]) == 3  # 1 opponent + 1 illegal model + 1 legal model
 
 
+@pytest.mark.asyncio
+async def test_evaluator_evaluate_all_stops_at_target_deviation(
+    mock_agent: MagicMock, sample_puzzle: Puzzle, mock_repo: MockRepository
+) -> None:
+    """
+    Test that evaluate_all cancels and drains remaining puzzles once the target RD is hit.
+    Why: Stopping early saves API cost, but cancelled tasks must be awaited before
+    returning. Otherwise they keep running (and writing games) after the caller moves on.
+    """
+
+    async def slow_move(*args: object) -> tuple[str, int, int]:
+        await asyncio.sleep(0.01)  # Yield so other puzzles are still pending
+        return ("Nxe5", 10, 5)
+
+    mock_agent.get_move.side_effect = slow_move
+    mock_agent.rd = 40.0  # Already below the target after the first update
+    puzzles = [replace(sample_puzzle, id=f"p{i}") for i in range(10)]
+
+    evaluator = Evaluator(mock_agent, puzzles, mock_repo)
+    await evaluator.evaluate_all(target_deviation=50.0, max_concurrent=1)
+
+    assert len(mock_repo.benchmarks) == 1
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_evaluator_evaluate_all_runs_a_bounded_worker_pool(
+    mock_agent: MagicMock, sample_puzzle: Puzzle, mock_repo: MockRepository
+) -> None:
+    """
+    Test that evaluate_all plays every puzzle with at most max_concurrent tasks.
+    Why: Evaluations can cover thousands of puzzles. Creating a task per puzzle up
+    front would keep all of them pending on the event loop, so a fixed set of workers
+    must share the puzzles, each one played exactly once.
+    """
+    task_counts: list[int] = []
+
+    async def slow_move(*args: object) -> tuple[str, int, int]:
+        task_counts.append(len(asyncio.all_tasks()))
+        await asyncio.sleep(0.001)
+        return ("Nxe5", 10, 5)
+
+    mock_agent.get_move.side_effect = slow_move
+    puzzles = [replace(sample_puzzle, id=f"p{i}") for i in range(10)]
+
+    evaluator = Evaluator(mock_agent, puzzles, mock_repo)
+    await evaluator.evaluate_all(max_concurrent=3)
+
+    assert len(mock_repo.benchmarks) == 10
+    assert sorted(game["puzzle_id"] for game in mock_repo.games.values()) == sorted(
+        p.id for p in puzzles
+    )
+    # The test's own task plus the workers
+    assert max(task_counts) == 4
+
+
 def test_evaluator_update_agent_rating(mock_agent: MagicMock, mock_repo: MockRepository) -> None:
     """
     Test the Glicko-2 rating update logic.
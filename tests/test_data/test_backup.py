@@ -0,0 +1,139 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from chess_llm_eval.data.backup import FullDatabaseBackup, PuzzleBackup
+from chess_llm_eval.data.models import AgentData, MoveRecord, Puzzle
+from chess_llm_eval.data.sqlite import SQLiteRepository
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "storage.db")
+    repo = SQLiteRepository(path)
+    repo.save_agent(AgentData(name="agent1", is_reasoning=False, is_random=False))
+    repo.save_puzzles(
+        [
+            Puzzle(
+                id=f"p{i}",
+                fen="fen",
+                moves="e2e4 e7e5",
+                rating=1000 + i,
+                rating_deviation=80,
+                themes="fork",
+                type="tactic",
+            )
+            for i in range(3)
+        ]
+    )
+    game_id = repo.create_game("p0", "agent1")
+    repo.save_moves(
+        game_id,
+        [
+            MoveRecord(fen="fen", expected_move="e4", actual_move="e4", is_illegal=False),
+            MoveRecord(fen="fen2", expected_move="e5", actual_move="Ké7", is_illegal=True),
+        ],
+    )
+    repo.update_game_result(game_id, True)
+    repo.save_benchmark(game_id, 1450.0, 300.0, 0.06)
+    repo.conn.close()
+    return path
+
+
+def test_puzzle_backup_round_trip(db_path: str, tmp_path: Path) -> None:
+    """
+    Test exporting puzzles and importing them into a fresh database.
+    Why: The puzzle backup is how the curated puzzle set is versioned and re-seeded.
+    Every field must survive the export/import cycle unchanged.
+    """
+    json_path = str(tmp_path / "puzzles.json")
+    PuzzleBackup(db_path).export_puzzles_to_json(json_path)
+
+    restored = PuzzleBackup(str(tmp_path / "fresh.db"))
+    restored.import_puzzles_from_json(json_path)
+
+    assert restored.repo.get_puzzles() == SQLiteRepository(db_path).get_puzzles()
+
+
+def test_puzzle_backup_pretty_is_opt_in(db_path: str, tmp_path: Path) -> None:
+    """
+    Test that puzzle exports are compact by default and indented only on request.
+    Why: Indentation roughly doubles the size of large backups, so it is reserved for
+    files meant to be read by hand. Both layouts must hold the same puzzles.
+    """
+    compact_path = tmp_path / "compact.json"
+    pretty_path = tmp_path / "pretty.json"
+    backup = PuzzleBackup(db_path)
+    backup.export_puzzles_to_json(str(compact_path))
+    backup.export_puzzles_to_json(str(pretty_path), pretty=True)
+
+    assert len(compact_path.read_bytes().splitlines()) == 1
+    assert len(pretty_path.read_bytes()) > len(compact_path.read_bytes())
+    assert json.loads(pretty_path.read_bytes()) == json.loads(compact_path.read_bytes())
+
+
+def test_puzzle_backup_jsonl_round_trip(
+    db_path: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test the JSON Lines puzzle backup format, including batched imports.
+    Why: Large puzzle sets are exported as one object per line so neither side holds
+    the whole file in memory. Batch boundaries on import must not drop or repeat rows.
+    """
+    monkeypatch.setattr("chess_llm_eval.data.backup.IMPORT_BATCH_SIZE", 2)
+    json_path = tmp_path / "puzzles.jsonl"
+    PuzzleBackup(db_path).export_puzzles_to_json(str(json_path))
+    assert len(json_path.read_bytes().splitlines()) == 3
+
+    restored = PuzzleBackup(str(tmp_path / "fresh.db"))
+    restored.import_puzzles_from_json(str(json_path))
+
+    assert restored.repo.get_puzzles() == SQLiteRepository(db_path).get_puzzles()
+
+
+def test_full_backup_round_trip(db_path: str, tmp_path: Path) -> None:
+    """
+    Test exporting every table to JSON and restoring it into an empty database.
+    Why: The full backup is the recovery path for evaluation results. Restoring it must
+    reproduce every row, including non-ASCII move text and illegal-move flags, and leave
+    the database's own journal mode in place after the fast-restore pragmas. The target
+    is snapshotted first because the unsynced restore cannot survive a crash.
+    """
+    json_path = FullDatabaseBackup(db_path).export_all_to_json(str(tmp_path / "full.json"))
+
+    fresh_path = str(tmp_path / "fresh.db")
+    fresh = SQLiteRepository(fresh_path).conn
+    fresh.execute("PRAGMA journal_mode = WAL")
+    fresh.close()
+    snapshot_path = tmp_path / "pre_restore.db"
+    FullDatabaseBackup(fresh_path).restore_from_json(json_path, str(snapshot_path))
+    snapshot = sqlite3.connect(snapshot_path)
+    assert snapshot.execute("SELECT COUNT(*) FROM puzzle").fetchone()[0] == 0
+
+    original = FullDatabaseBackup(db_path).conn
+    restored = FullDatabaseBackup(fresh_path).conn
+    for table in ["puzzle", "agent", "game", "move", "benchmark"]:
+        query = f"SELECT * FROM {table} ORDER BY rowid"
+        assert [tuple(r) for r in restored.execute(query)] == [
+            tuple(r) for r in original.execute(query)
+        ]
+    assert restored.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_dump_binary_and_text(db_path: str, tmp_path: Path) -> None:
+    """
+    Test both SQLite snapshot formats produced by sqlite_dump.
+    Why: The binary copy is the default disaster-recovery snapshot and must open as a
+    complete database. The SQL text dump must replay into an identical database.
+    """
+    backup = FullDatabaseBackup(db_path)
+    binary_path = backup.sqlite_dump(str(tmp_path / "snapshot.db"))
+    sql_path = backup.sqlite_dump(str(tmp_path / "dump.sql"), sql_text=True)
+
+    replayed = sqlite3.connect(":memory:")
+    replayed.executescript(Path(sql_path).read_text(encoding="utf-8"))
+    for conn in (sqlite3.connect(binary_path), replayed):
+        assert conn.execute("SELECT COUNT(*) FROM puzzle").fetchone()[0] == 3
+        assert conn.execute("SELECT move FROM move ORDER BY id").fetchall() == [("e4",), ("Ké7",)]
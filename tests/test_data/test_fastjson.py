@@ -0,0 +1,22 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from chess_llm_eval.data import _fastjson
+
+
+def test_load_file_matches_loads(tmp_path: Path) -> None:
+    """
+    Test that load_file parses a file the same way loads parses its bytes.
+    Why: JSONRepository parses data.json through a memory map at startup. The result
+    must be identical, and an empty file must still raise a decode error.
+    """
+    path = tmp_path / "data.json"
+    path.write_bytes(_fastjson.dumps({"move": [{"move": "Ké7", "illegal_move": 1}]}))
+    empty = tmp_path / "empty.json"
+    empty.write_bytes(b"")
+
+    assert _fastjson.load_file(path) == _fastjson.loads(path.read_bytes())
+    with pytest.raises(json.JSONDecodeError):
+        _fastjson.load_file(empty)
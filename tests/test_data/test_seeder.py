@@ -0,0 +1,164 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from chess_llm_eval.data.seeder import PuzzleSeeder
+from chess_llm_eval.data.sqlite import SQLiteRepository
+
+HEADER = "PuzzleId,FEN,Moves,Rating,RatingDeviation,Popularity,NbPlays,Themes,GameUrl,OpeningTags\n"
+
+
+def _write_csv(path: Path, prefix: str, count: int) -> None:
+    rows = [
+        f"{prefix}{i},fen {prefix}{i},e2e4 e7e5,{1000 + i},{80 + i},{90 + i},{200 + i},"
+        f"theme{i},https://lichess.org/{prefix}{i},{'Italian_Game' if i % 2 else ''}\n"
+        for i in range(count)
+    ]
+    path.write_text(HEADER + "".join(rows), encoding="utf-8")
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    data = tmp_path / "data"
+    data.mkdir()
+    _write_csv(data / "TacticDB.csv", "t", 3)
+    _write_csv(data / "StrategicDB.csv", "s", 4)
+    _write_csv(data / "EndGameDB.csv", "e", 3)
+    return data
+
+
+def _seeded_rows(repo: SQLiteRepository) -> list[dict[str, object]]:
+    cursor = repo.conn.execute("SELECT * FROM puzzle ORDER BY rowid")
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def test_seed_interleaves_types_and_maps_columns(data_dir: Path) -> None:
+    """
+    Test seeding from the standard Lichess-format CSVs.
+    Why: The seeder takes the same number of puzzles from each category and interleaves
+    them so a limited evaluation run stays balanced. Every CSV column must land in its
+    Puzzle field, and blank optional cells must be stored as empty strings.
+    """
+    repo = SQLiteRepository(str(data_dir / "storage.db"))
+    synchronous = repo.conn.execute("PRAGMA synchronous").fetchone()[0]
+    PuzzleSeeder(repo).seed_from_standard_paths()
+
+    rows = _seeded_rows(repo)
+    assert [row["type"] for row in rows] == ["tactic", "strategy", "endgame"] * 3
+
+    by_id = {row["id"]: row for row in rows}
+    assert {str(pid)[0] for pid in by_id} == {"t", "s", "e"}
+    assert by_id["t1"] == {
+        "id": "t1",
+        "fen": "fen t1",
+        "moves": "e2e4 e7e5",
+        "rating": 1001,
+        "rating_deviation": 81,
+        "popularity": 91,
+        "nb_plays": 201,
+        "themes": "theme1",
+        "game_url": "https://lichess.org/t1",
+        "opening_tags": "Italian_Game",
+        "type": "tactic",
+    }
+    assert by_id["e0"]["opening_tags"] == ""
+
+    # The bulk-load pragmas only apply for the duration of the seed
+    assert repo.conn.execute("PRAGMA synchronous").fetchone()[0] == synchronous
+
+
+def test_seed_streams_csvs_in_chunks(data_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test seeding when the CSVs span several read chunks.
+    Why: Large Lichess exports are read and inserted chunk by chunk. Chunk boundaries
+    must not break the interleave or the per-category balance, and every puzzle of
+    the shortest category must still be seeded exactly once.
+    """
+    monkeypatch.setattr("chess_llm_eval.data.seeder.CSV_CHUNK_SIZE", 2)
+    repo = SQLiteRepository(str(data_dir / "storage.db"))
+    PuzzleSeeder(repo).seed_from_standard_paths()
+
+    rows = _seeded_rows(repo)
+    assert [row["type"] for row in rows] == ["tactic", "strategy", "endgame"] * 3
+    assert sorted(str(row["id"]) for row in rows if row["type"] == "tactic") == ["t0", "t1", "t2"]
+
+
+def test_seed_keeps_ids_as_text(data_dir: Path) -> None:
+    """
+    Test that numeric-looking puzzle ids survive CSV parsing unchanged.
+    Why: Lichess puzzle ids are opaque strings. Parsing them as numbers would drop
+    leading zeros and break lookups against the source data.
+    """
+    for name in ("TacticDB.csv", "StrategicDB.csv", "EndGameDB.csv"):
+        _write_csv(data_dir / name, "00", 1)
+    repo = SQLiteRepository(str(data_dir / "storage.db"))
+    PuzzleSeeder(repo).seed_from_standard_paths()
+
+    assert [row["id"] for row in _seeded_rows(repo)] == ["000"]
+
+
+def test_seed_accepts_mixed_header_conventions(data_dir: Path) -> None:
+    """
+    Test seeding when one CSV uses the Puzzle field names as headers.
+    Why: Puzzle CSVs come both from Lichess (CamelCase headers) and from our own
+    tooling (field-name headers). Mixing them in one seed must not blank out columns.
+    """
+    csv_path = data_dir / "StrategicDB.csv"
+    lines = csv_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    lines[0] = (
+        "id,fen,moves,rating,rating_deviation,popularity,nb_plays,themes,game_url,opening_tags\n"
+    )
+    csv_path.write_text("".join(lines), encoding="utf-8")
+
+    repo = SQLiteRepository(str(data_dir / "storage.db"))
+    PuzzleSeeder(repo).seed_from_standard_paths()
+
+    rows = _seeded_rows(repo)
+    assert {row["type"] for row in rows} == {"tactic", "strategy", "endgame"}
+    for row in rows:
+        assert row["fen"] == f"fen {row['id']}"
+        assert row["rating"] == 1000 + int(str(row["id"])[1:])
+
+
+def test_seed_matches_csv_names_case_insensitively(data_dir: Path) -> None:
+    """
+    Test seeding when a CSV's name differs from the expected one only in case.
+    Why: The CSVs are named by hand, and the seeder used to find them on macOS but
+    silently skip them on Linux, leaving a category unseeded.
+    """
+    (data_dir / "EndGameDB.csv").rename(data_dir / "endgamedb.csv")
+    repo = SQLiteRepository(str(data_dir / "storage.db"))
+    PuzzleSeeder(repo).seed_from_standard_paths()
+
+    rows = _seeded_rows(repo)
+    assert [row["type"] for row in rows] == ["tactic", "strategy", "endgame"] * 3
+
+
+def test_seed_warns_about_missing_csvs(data_dir: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """
+    Test that a missing standard CSV is reported.
+    Why: Seeding continues with the categories that exist, so without a warning a
+    missing category would go unnoticed until the evaluation results are skewed.
+    """
+    (data_dir / "EndGameDB.csv").unlink()
+    repo = SQLiteRepository(str(data_dir / "storage.db"))
+    with caplog.at_level(logging.WARNING, logger="chess_llm_eval.data.seeder"):
+        PuzzleSeeder(repo).seed_from_standard_paths()
+
+    assert "EndGameDB.csv" in caplog.text
+    assert {row["type"] for row in _seeded_rows(repo)} == {"tactic", "strategy"}
+
+
+def test_seed_without_csvs_is_a_no_op(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test seeding when none of the standard CSVs exist.
+    Why: Seeding runs on startup of fresh checkouts. Missing CSVs must leave the
+    database untouched instead of raising.
+    """
+    monkeypatch.chdir(tmp_path)
+    repo = SQLiteRepository(str(tmp_path / "storage.db"))
+    PuzzleSeeder(repo).seed_from_standard_paths()
+
+    assert _seeded_rows(repo) == []
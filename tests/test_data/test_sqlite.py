@@ -1,7 +1,14 @@
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
 import pytest
 
 from chess_llm_eval.data.models import AgentData, MoveRecord, Puzzle
-from chess_llm_eval.data.sqlite import SQLiteRepository
+from chess_llm_eval.data.sqlite import LATEST_BENCHMARK_QUERY, SQLiteRepository
 
 
 @pytest.fixture
@@ -25,6 +32,30 @@ def test_sqlite_create_tables(repo: SQLiteRepository) -> None:
     assert "move" in tables
     assert "benchmark" in tables
 
+    cursor = repo.conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+    indexes = {row[0] for row in cursor.fetchall()}
+    assert {"idx_game_agent_date", "idx_move_game_tokens"} <= indexes
+
+
+def test_sqlite_connection_pragmas(tmp_path: Path) -> None:
+    """
+    Test the pragmas applied to writable and immutable connections.
+    Why: Evaluation runs commit after every game. WAL with synchronous=NORMAL avoids
+    an fsync per commit, and the immutable connection used for deployments must stay
+    read-only even though it is opened on the same file and must memory-map it.
+    """
+    db_path = str(tmp_path / "storage.db")
+    writer = SQLiteRepository(db_path)
+    assert writer.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert writer.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    writer.conn.close()
+
+    reader = SQLiteRepository(db_path, immutable=True)
+    assert reader.get_puzzles() == []
+    assert reader.conn.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+    with pytest.raises(sqlite3.OperationalError):
+        reader.conn.execute("DELETE FROM puzzle")
+
 
 def test_sqlite_agent_ops(repo: SQLiteRepository) -> None:
     """
@@ -81,6 +112,94 @@ def test_sqlite_puzzle_ops(repo: SQLiteRepository) -> None:
     assert len(uncompleted) == 2
 
 
+def test_sqlite_iter_puzzle_rows(repo: SQLiteRepository) -> None:
+    """
+    Test streaming puzzles as plain dicts across fetch batches.
+    Why: Backups export puzzles from these rows directly. They must carry the same
+    fields as Puzzle and must not drop rows at batch boundaries.
+    """
+    puzzles = [
+        Puzzle(
+            id=f"p{i}",
+            fen="fen",
+            moves="m1 m2",
+            rating=1000 + i,
+            rating_deviation=100,
+            themes="t1",
+            type="type1",
+        )
+        for i in range(5)
+    ]
+    repo.save_puzzles(puzzles)
+
+    rows = list(repo.iter_puzzle_rows(batch_size=2))
+    assert rows == [vars(p) for p in puzzles]
+
+
+def test_sqlite_weighted_puzzle_rating_cache(repo: SQLiteRepository) -> None:
+    """
+    Test the cached popularity-weighted puzzle rating.
+    Why: The dashboard asks for the weighted rating on every render, so it is cached.
+    Any write must invalidate it, or the dashboard would keep showing the rating of
+    the puzzle set before the last change.
+    """
+    assert repo.get_weighted_puzzle_rating() == (None, None)
+
+    def puzzle(puzzle_id: str, rating: int, popularity: int) -> Puzzle:
+        return Puzzle(
+            id=puzzle_id,
+            fen="fen",
+            moves="m1 m2",
+            rating=rating,
+            rating_deviation=100,
+            themes="t1",
+            type="type1",
+            popularity=popularity,
+        )
+
+    repo.save_puzzles([puzzle("p1", 1000, 1), puzzle("p2", 1300, 2)])
+    assert repo.get_weighted_puzzle_rating() == (1200.0, 100.0)
+
+    # Uncommitted writes are read through the writer connection
+    repo.conn.execute("UPDATE puzzle SET rating = 2000")
+    assert repo.get_weighted_puzzle_rating() == (2000.0, 100.0)
+    repo.conn.commit()
+    assert repo.get_weighted_puzzle_rating() == (2000.0, 100.0)
+
+    repo.save_puzzles([puzzle("p3", 2600, 3)])
+    assert repo.get_weighted_puzzle_rating() == (2300.0, 100.0)
+
+
+def test_sqlite_weighted_puzzle_rating_sees_other_writers(tmp_path: Path) -> None:
+    """
+    Test that the cached weighted rating follows commits from other connections.
+    Why: The seeder and the evaluation run in other processes than the dashboard, so
+    the cache can't rely on this repository's own writes to know when it is stale.
+    """
+    db_path = str(tmp_path / "storage.db")
+    repo = SQLiteRepository(db_path)
+    repo.save_puzzles(
+        [
+            Puzzle(
+                id="p1",
+                fen="fen",
+                moves="m1 m2",
+                rating=1000,
+                rating_deviation=100,
+                themes="t1",
+                type="type1",
+                popularity=1,
+            )
+        ]
+    )
+    assert repo.get_weighted_puzzle_rating() == (1000.0, 100.0)
+
+    with sqlite3.connect(db_path) as other:
+        other.execute("UPDATE puzzle SET rating = 1500")
+    assert repo.get_weighted_puzzle_rating() == (1500.0, 100.0)
+    repo.close()
+
+
 def test_sqlite_game_and_move_ops(repo: SQLiteRepository) -> None:
     """
     Test creating games and saving moves.
@@ -115,6 +234,80 @@ def test_sqlite_game_and_move_ops(repo: SQLiteRepository) -> None:
     assert row["illegal_move"] == 0
 
 
+def test_sqlite_save_moves_bulk(repo: SQLiteRepository) -> None:
+    """
+    Test saving all moves of a game in one call.
+    Why: The evaluator buffers a game's moves and flushes them together. Order and the
+    illegal-move flag must survive the bulk insert, since replays and analytics read
+    moves back by id.
+    """
+    repo.save_agent(AgentData(name="agent1", is_reasoning=False, is_random=False))
+    game_id = repo.create_game("p1", "agent1")
+
+    repo.save_moves(
+        game_id,
+        [
+            MoveRecord(fen="fen1", expected_move="m1", actual_move="m1", is_illegal=False),
+            MoveRecord(fen="fen2", expected_move="m2", actual_move="bad", is_illegal=True),
+            MoveRecord(fen="fen2", expected_move="m2", actual_move="m2", is_illegal=False),
+        ],
+    )
+
+    rows = repo.conn.execute(
+        "SELECT move, illegal_move FROM move WHERE game_id = ? ORDER BY id", (game_id,)
+    ).fetchall()
+    assert [(r["move"], r["illegal_move"]) for r in rows] == [("m1", 0), ("bad", 1), ("m2", 0)]
+
+
+def test_sqlite_failed_write_is_rolled_back(repo: SQLiteRepository) -> None:
+    """
+    Test that a write that fails part-way leaves nothing behind.
+    Why: Without a rollback, the rows inserted before the error stay pending on the
+    shared connection and are committed by the next unrelated write.
+    """
+    repo.save_agent(AgentData(name="agent1", is_reasoning=False, is_random=False))
+    game_id = repo.create_game("p1", "agent1")
+    move = MoveRecord(fen="fen1", expected_move="m1", actual_move="m1", is_illegal=False)
+
+    # The same legal move twice violates idx_unique_legal_move on the second row
+    with pytest.raises(sqlite3.IntegrityError):
+        repo.save_moves(game_id, [move, move])
+    repo.update_game_result(game_id, True)
+
+    assert repo.conn.execute("SELECT COUNT(*) FROM move").fetchone()[0] == 0
+
+
+def test_sqlite_transaction_commits_once(tmp_path: Path) -> None:
+    """
+    Test grouping several writes in one transaction.
+    Why: The evaluator stores a game's moves and result together. Other connections
+    must see either all of those writes or none, and an error part-way through must
+    roll back every write in the block, including ones from nested blocks.
+    """
+    db_path = str(tmp_path / "storage.db")
+    repo = SQLiteRepository(db_path)
+    observer = sqlite3.connect(db_path)
+    repo.save_agent(AgentData(name="agent1", is_reasoning=False, is_random=False))
+    game_id = repo.create_game("p1", "agent1")
+    move = MoveRecord(fen="fen1", expected_move="m1", actual_move="m1", is_illegal=False)
+
+    with repo.transaction():
+        repo.save_moves(game_id, [move])
+        with repo.transaction():
+            repo.update_game_result(game_id, True)
+        assert observer.execute("SELECT COUNT(*) FROM move").fetchone()[0] == 0
+    assert observer.execute("SELECT COUNT(*) FROM move").fetchone()[0] == 1
+    assert observer.execute("SELECT failed FROM game").fetchone()[0] == 1
+
+    retry = MoveRecord(fen="fen2", expected_move="m2", actual_move="m2", is_illegal=False)
+    with pytest.raises(RuntimeError), repo.transaction():
+        repo.save_moves(game_id, [retry])
+        repo.update_game_result(game_id, False)
+        raise RuntimeError("boom")
+    assert repo.conn.execute("SELECT COUNT(*) FROM move").fetchone()[0] == 1
+    assert repo.conn.execute("SELECT failed FROM game").fetchone()[0] == 1
+
+
 def test_sqlite_benchmark_ops(repo: SQLiteRepository) -> None:
     """
     Test saving benchmark results (rating updates).
@@ -149,3 +342,137 @@ def test_sqlite_benchmark_ops(repo: SQLiteRepository) -> None:
     # Verify benchmark entry
     last = repo.get_last_benchmark("agent1")
     assert last == (1600.0, 300.0, 0.05)
+
+    # Callers that know the agent skip the game lookup; the cache must match either way
+    next_game_id = repo.create_game("p2", "agent1")
+    repo.save_benchmark(next_game_id, 1650.0, 280.0, 0.05, agent_name="agent1")
+    row = repo.conn.execute("SELECT rating, rd FROM agent WHERE name = 'agent1'").fetchone()
+    assert tuple(row) == (1650.0, 280.0)
+
+
+def test_sqlite_leaderboard_order(repo: SQLiteRepository) -> None:
+    """
+    Test leaderboard ranking order and per-agent game stats.
+    Why: The leaderboard is sorted by the query itself. Higher ratings must rank first,
+    agents with equal ratings must keep a stable name order, and agents without games
+    must still be listed with zeroed stats.
+    """
+    for name, rating in [("charlie", 1500.0), ("alpha", 1700.0), ("bravo", 1500.0)]:
+        repo.save_agent(AgentData(name=name, is_reasoning=False, is_random=False, rating=rating))
+    repo.save_puzzles(
+        [
+            Puzzle(
+                id="p1",
+                fen="fen",
+                moves="e2e4",
+                rating=1000,
+                rating_deviation=80,
+                themes="",
+                type="tactic",
+            )
+        ]
+    )
+    repo.update_game_result(repo.create_game("p1", "alpha"), False)
+
+    leaderboard = repo.get_leaderboard()
+    assert [ranking.name for ranking in leaderboard] == ["alpha", "bravo", "charlie"]
+    assert (leaderboard[0].games_played, leaderboard[0].win_rate) == (1, 1.0)
+    assert (leaderboard[2].games_played, leaderboard[2].win_rate) == (0, 0.0)
+
+
+def test_sqlite_latest_benchmark_rollup(repo: SQLiteRepository) -> None:
+    """
+    Test the latest-benchmark roll-up used by get_agent and get_all_agents.
+    Why: The roll-up is maintained by triggers instead of recomputed per request. It
+    must track each agent's newest benchmark however it was inserted, and match the
+    result derived from the benchmark table that read-only databases still use.
+    """
+    for name in ("agent1", "agent2"):
+        repo.save_agent(AgentData(name=name, is_reasoning=False, is_random=False))
+    games = [repo.create_game(f"p{i}", f"agent{i % 2 + 1}") for i in range(4)]
+    for i, game_id in enumerate(games):
+        repo.save_benchmark(game_id, 1500.0 + i, 300.0 - i, 0.06)
+    # Restores insert benchmark rows directly instead of through save_benchmark
+    repo.conn.execute("DELETE FROM benchmark WHERE game_id = ?", (games[3],))
+    repo.conn.execute(
+        "INSERT INTO benchmark (game_id, agent_rating, agent_deviation, agent_volatility) "
+        "VALUES (?, 1600.0, 250.0, 0.05)",
+        (games[3],),
+    )
+    repo.conn.commit()
+
+    ratings = {agent.name: agent.rating for agent in repo.get_all_agents()}
+    assert ratings == {"agent1": 1502.0, "agent2": 1600.0}
+    assert [repo.get_agent(name) for name in ratings] == repo.get_all_agents()
+
+    rollup = repo.conn.execute("SELECT * FROM latest_benchmark ORDER BY agent_name")
+    derived = repo.conn.execute(f"SELECT * FROM ({LATEST_BENCHMARK_QUERY}) ORDER BY agent_name")
+    assert [tuple(row) for row in rollup] == [tuple(row) for row in derived]
+
+
+def test_sqlite_reporting_reads_use_thread_readers(tmp_path: Path) -> None:
+    """
+    Test the per-thread read-only connections used by the reporting queries.
+    Why: Dashboards run reports from several worker threads while an evaluation
+    writes. Each thread needs its own connection that sees committed writes, cannot
+    write itself, and is closed together with the repository.
+    """
+    repo = SQLiteRepository(str(tmp_path / "storage.db"))
+    repo.save_agent(AgentData(name="agent1", is_reasoning=False, is_random=False))
+
+    readers: list[sqlite3.Connection] = []
+    worker = threading.Thread(target=lambda: readers.append(repo._reader()))
+    worker.start()
+    worker.join()
+    readers.append(repo._reader())
+
+    assert readers[0] is not readers[1]
+    assert repo._reader() is readers[1]
+    assert [ranking.name for ranking in repo.get_leaderboard()] == ["agent1"]
+    with pytest.raises(sqlite3.OperationalError):
+        readers[1].execute("DELETE FROM agent")
+
+    repo.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        readers[0].execute("SELECT 1")
+
+
+def test_sqlite_transactions_are_serialized_across_threads(tmp_path: Path) -> None:
+    """
+    Test that a transaction owns the writer until it ends and its reads see its writes.
+    Why: The web server shares one repository across its threadpool. Other threads must
+    neither read uncommitted rows nor interleave BEGIN/COMMIT on the writer connection.
+    """
+    repo = SQLiteRepository(str(tmp_path / "storage.db"))
+    seen: list[Any] = []
+
+    def read_and_write() -> None:
+        seen.append(repo.get_agent("agent1"))
+        repo.save_agent(AgentData(name="agent2", is_reasoning=False, is_random=False))
+
+    with repo.transaction():
+        repo.save_agent(AgentData(name="agent1", is_reasoning=False, is_random=False))
+        assert repo.get_agent("agent1") is not None
+        worker = threading.Thread(target=read_and_write)
+        worker.start()
+        worker.join(timeout=0.2)
+        assert worker.is_alive()  # Waiting for the writer
+        assert seen == [None]  # Uncommitted row is invisible to other threads
+    worker.join()
+
+    assert {agent.name for agent in repo.get_all_agents()} == {"agent1", "agent2"}
+    repo.close()
+
+
+def test_sqlite_import_defers_pandas() -> None:
+    """
+    Test that importing the repository does not import pandas.
+    Why: pandas dominates the import time of the data layer, but only the reporting
+    queries need it. Evaluation runs and serverless cold starts that never build a
+    DataFrame must not pay for it.
+    """
+    code = "import sys, chess_llm_eval.data.sqlite; print('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
@@ -4,14 +4,18 @@ These tests verify that the JSON repository produces identical results
 to the SQLite repository, ensuring no data loss during conversion.
 """
 
+import json
+import sqlite3
 import subprocess
 import sys
+import warnings
 from pathlib import Path
 
 import pytest
 
 from chess_llm_eval.data.json_repo import JSONRepository
 from chess_llm_eval.data.sqlite import SQLiteRepository
+from website.server.analytics import build_analytics_response
 
 
 def ensure_json_data() -> None:
@@ -101,6 +105,24 @@ class TestDataIntegrity:
             msg = f"Mismatch at position {i}"
             assert sqlite_entry.name == json_entry.name, msg
 
+    def test_row_reads_match_sqlite(
+        self, sqlite_repo: SQLiteRepository, json_repo: JSONRepository
+    ) -> None:
+        """Verify row-level reads return identical model objects.
+
+        Why: JSONRepository builds models straight from the raw JSON rows. Nullable
+        columns must come back as None (not NaN) and ordering must match SQLite.
+        """
+        assert json_repo.get_puzzles() == sqlite_repo.get_puzzles()
+        for agent in sqlite_repo.get_all_agents():
+            assert json_repo.get_uncompleted_puzzles(
+                agent.name, limit=5
+            ) == sqlite_repo.get_uncompleted_puzzles(agent.name, limit=5)
+
+        game_ids = [row["id"] for row in sqlite_repo.conn.execute("SELECT id FROM game LIMIT 50")]
+        for game_id in game_ids:
+            assert json_repo.get_game(game_id) == sqlite_repo.get_game(game_id)
+
     def test_analytics_dataframe_columns(
         self, sqlite_repo: SQLiteRepository, json_repo: JSONRepository
     ) -> None:
@@ -162,6 +184,22 @@ class TestJSONRepositoryFunctionality:
         result = repo.get_puzzle("INVALID_ID_12345")
         assert result is None
 
+    def test_get_puzzle_returns_independent_copies(self, repo: JSONRepository) -> None:
+        """Test that changing a returned puzzle does not affect later lookups.
+
+        Why: The repository is shared by every request, and Puzzle is mutable.
+        """
+        puzzle_id = repo.get_puzzles(limit=1)[0].id
+        first = repo.get_puzzle(puzzle_id)
+        assert first is not None
+        rating = first.rating
+        first.rating = -1
+
+        second = repo.get_puzzle(puzzle_id)
+        assert second is not None
+        assert second is not first
+        assert second.rating == rating
+
     def test_get_agent_returns_none_for_invalid(self, repo: JSONRepository) -> None:
         """Test that invalid agent names return None.
 
@@ -183,6 +221,21 @@ class TestJSONRepositoryFunctionality:
         # Uncompleted should be less than or equal to total
         assert uncompleted <= all_puzzles
 
+    def test_solutionary_moves_count_correct_moves(self, repo: JSONRepository) -> None:
+        """Test that solutionary move counts match the legal moves that hit the solution.
+
+        Why: The per-move count is the accuracy signal for each expected move. It must
+        count the agent's legal moves that equal the correct move, not be all zeros.
+        """
+        df = repo.get_solutionary_moves_data()
+
+        legal = repo.moves_df[repo.moves_df["illegal_move"] == 0]
+        expected = int((legal["move"] == legal["correct_move"]).sum())
+
+        assert list(df.columns) == ["agent_name", "correct_move", "move"]
+        assert int(df["move"].sum()) == expected
+        assert expected > 0
+
     def test_write_operations_raise_error(self, repo: JSONRepository) -> None:
         """Test that write operations are properly disabled.
 
@@ -205,6 +258,113 @@ class TestJSONRepositoryFunctionality:
             repo.save_move(1, move)
 
 
+class TestSparseAnalytics:
+    """Test analytics on data where not every agent covers every category."""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path) -> JSONRepository:
+        """Provide a repository where beta never saw a type B puzzle or made a move."""
+        puzzle = {"fen": "8/8/8/8/8/8/8/8 w - - 0 1", "moves": "e2e4", "rating": 1500}
+        data = {
+            "puzzle": [
+                {**puzzle, "id": "p1", "type": "A", "rating_deviation": 80},
+                {**puzzle, "id": "p2", "type": "B", "rating_deviation": 80},
+            ],
+            "agent": [{"name": "alpha"}, {"name": "beta"}],
+            "game": [
+                {
+                    "id": 1,
+                    "agent_name": "alpha",
+                    "puzzle_id": "p1",
+                    "failed": 0,
+                    "date": "2024-01-01 12:00:00",
+                },
+                {"id": 2, "agent_name": "alpha", "puzzle_id": "p2", "failed": 1, "date": None},
+                {"id": 3, "agent_name": "beta", "puzzle_id": "p1", "failed": 1, "date": None},
+            ],
+            "move": [
+                {
+                    "game_id": game_id,
+                    "move": "e4",
+                    "correct_move": "e4",
+                    "illegal_move": 0,
+                    "prompt_tokens": 10,
+                    "completion_tokens": 5,
+                }
+                for game_id in (1, 2)
+            ],
+            "benchmark": [
+                {
+                    "id": 1,
+                    "game_id": 1,
+                    "agent_rating": 1510.0,
+                    "agent_deviation": 300.0,
+                    "agent_volatility": 0.06,
+                }
+            ],
+        }
+        json_path = tmp_path / "data.json"
+        json_path.write_text(json.dumps(data))
+        return JSONRepository(json_path=str(json_path))
+
+    def test_dataframes_are_built_on_first_use(self, repo: JSONRepository) -> None:
+        """Test that loading and row reads don't build the analytics DataFrames.
+
+        Why: The raw rows are kept for row reads. Building the frames at load time
+        would hold a second copy of the data on the memory-limited serverless function.
+        """
+        frames = ["puzzles_df", "agents_df", "games_df", "moves_df", "benchmarks_df"]
+        repo.get_agent("alpha")
+        repo.get_agent_games("alpha")
+        assert not any(name in vars(repo) for name in frames)
+
+        repo.get_illegal_moves_data()
+        assert {"games_df", "moves_df"} <= vars(repo).keys()
+
+    def test_groupbys_return_only_observed_groups(self, repo: JSONRepository) -> None:
+        """Test that grouped analytics only contain combinations present in the data.
+
+        Why: Agent names and puzzle types are categorical; grouping them without
+        observed=True adds empty agent/type rows and NaN rows for agents without moves.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            by_agent = repo.get_puzzle_outcome_data_by_agent()
+            outcomes = repo.get_puzzle_outcomes_by_agent_data()
+            tokens = repo.get_token_usage_per_move_data()
+            per_puzzle = repo.get_token_usage_per_puzzle_data()
+
+        expected = {("alpha", "A"), ("alpha", "B"), ("beta", "A")}
+        assert set(zip(by_agent["agent_name"], by_agent["type"], strict=True)) == expected
+        assert set(zip(outcomes["agent_name"], outcomes["type"], strict=True)) == expected
+        assert list(tokens["agent_name"]) == ["alpha"]
+        assert list(per_puzzle["agent_name"]) == ["alpha"]
+        assert not tokens.isna().any().any()
+
+    def test_analytics_frames_match_sqlite_column_types(self, repo: JSONRepository) -> None:
+        """Test that the website analytics run on JSONRepository frames without warnings.
+
+        Why: Categories are internal to JSONRepository. Returned frames must use plain
+        string columns like SQLiteRepository, so consumers grouping without observed=True
+        neither warn nor get empty groups on the Vercel path.
+        """
+        frames = [
+            repo.get_benchmark_data(),
+            repo.get_final_ratings_data(),
+            repo.get_illegal_moves_data(),
+            repo.get_puzzle_outcomes_by_agent_data(),
+            repo.get_solutionary_moves_data(),
+        ]
+        for frame in frames:
+            assert frame.select_dtypes("category").empty
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            response = build_analytics_response(repo)
+
+        assert [trend.agent_name for trend in response.rating_trends] == ["alpha"]
+
+
 class TestBuildScript:
     """Test the build script functionality."""
 
@@ -226,3 +386,38 @@ class TestBuildScript:
         assert result.returncode == 0, f"Build script failed: {result.stderr}"
         assert "SUCCESS" in result.stdout, "Build did not report success"
         assert Path("data.json").exists(), "data.json was not created"
+
+    def test_build_script_creates_missing_analytics_indexes(self, tmp_path: Path) -> None:
+        """Verify build.py adds the analytics join indexes to older databases.
+
+        Why: Databases created before the indexes were part of the schema would
+        otherwise run every analytics join as a full table scan.
+        """
+        db_path = tmp_path / "old.db"
+        repo = SQLiteRepository(db_path=str(db_path))
+        repo.conn.executescript("""
+            DROP INDEX idx_game_agent_name;
+            DROP INDEX idx_game_puzzle_id;
+            DROP INDEX idx_move_game_id;
+        """)
+        repo.conn.close()
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "build.py",
+                "--db-path",
+                str(db_path),
+                "--output-path",
+                str(tmp_path / "data.json"),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, f"Build script failed: {result.stderr}"
+
+        with sqlite3.connect(db_path) as conn:
+            indexes = {
+                row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+            }
+        assert {"idx_game_agent_name", "idx_game_puzzle_id", "idx_move_game_id"} <= indexes
@@ -0,0 +1,83 @@
+import sqlite3
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from chess_llm_eval.providers.cache import CachedProvider
+
+MESSAGES = [{"role": "user", "content": "FEN: 8/8/8/8/8/8/8/K6k w - - 0 1"}]
+
+
+@pytest.fixture
+def wrapped() -> AsyncMock:
+    provider = AsyncMock()
+    provider.complete = AsyncMock(return_value=("<FinalMove>Kb1</FinalMove>", 10, 20))
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_cached_provider_reuses_identical_requests(
+    wrapped: AsyncMock, tmp_path: Path
+) -> None:
+    """
+    Test that repeated requests are answered from the persistent cache.
+    Why: Re-running an evaluation re-sends prompts that were already paid for. An
+    identical request must not reach the API again, even from a new process, and must
+    return the token counts of the original response. Any change to the request must
+    still miss the cache.
+    """
+    db_path = str(tmp_path / "cache.db")
+    cached = CachedProvider(wrapped, db_path)
+
+    first = await cached.complete(MESSAGES, model="m", temperature=0.2)
+    assert await cached.complete(MESSAGES, model="m", temperature=0.2) == first
+    assert wrapped.complete.await_count == 1
+
+    await cached.complete(MESSAGES, model="m", temperature=0.4)
+    await cached.complete(MESSAGES, model="other", temperature=0.2)
+    assert wrapped.complete.await_count == 3
+    await cached.close()
+
+    reopened = CachedProvider(wrapped, db_path)
+    assert await reopened.complete(MESSAGES, model="m", temperature=0.2) == (
+        "<FinalMove>Kb1</FinalMove>",
+        10,
+        20,
+    )
+    assert wrapped.complete.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_provider_does_not_cache_errors(wrapped: AsyncMock, tmp_path: Path) -> None:
+    """
+    Test that failed requests are not cached.
+    Why: Provider errors such as rate limits are transient. Caching them would make
+    every later identical request fail without ever reaching the API.
+    """
+    wrapped.complete.side_effect = [RuntimeError("429"), ("e4", 1, 2)]
+    cached = CachedProvider(wrapped, str(tmp_path / "cache.db"))
+
+    with pytest.raises(RuntimeError):
+        await cached.complete(MESSAGES, model="m")
+    assert await cached.complete(MESSAGES, model="m") == ("e4", 1, 2)
+    assert wrapped.complete.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_provider_close_closes_wrapped_provider(
+    wrapped: AsyncMock, tmp_path: Path
+) -> None:
+    """
+    Test that closing the cache also closes the provider it wraps.
+    Why: Callers close whatever provider they hold with `await provider.close()`. When
+    that provider is the cache, the wrapped client's HTTP connections must still be
+    released.
+    """
+    cached = CachedProvider(wrapped, str(tmp_path / "cache.db"))
+
+    await cached.close()
+
+    wrapped.close.assert_awaited_once()
+    with pytest.raises(sqlite3.ProgrammingError):
+        cached.conn.execute("SELECT 1")
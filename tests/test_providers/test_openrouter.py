@@ -73,3 +73,17 @@ async def test_openrouter_complete_empty_response(
 
     with pytest.raises(ValueError, match="Empty response"):
         await openrouter_provider.complete([{"role": "user", "content": "hi"}], model="test-model")
+
+
+@pytest.mark.asyncio
+async def test_openrouter_close_releases_client(
+    openrouter_provider: OpenRouterProvider, mock_openai_client: AsyncMock
+) -> None:
+    """
+    Test closing the provider.
+    Why: Every request reuses the client's pooled keep-alive connections. Runners close
+    the provider when they finish so those sockets are released instead of leaking
+    until interpreter exit.
+    """
+    await openrouter_provider.close()
+    mock_openai_client.close.assert_awaited_once()
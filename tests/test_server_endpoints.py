@@ -1,11 +1,17 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
 
 from chess_llm_eval.data.models import AgentData, Game, MoveRecord, Puzzle
-from website.server.dependencies import get_repository
+from chess_llm_eval.data.sqlite import SQLiteRepository
+from website.server import dependencies
+from website.server.dependencies import close_repository, get_repository
 from website.server.main import app
 
 # Dummy data for testing
@@ -85,7 +91,17 @@ class MockRepository:
     def save_move(self, game_id: int, move: MoveRecord) -> None:
         pass
 
-    def save_benchmark(self, game_id: int, rating: float, rd: float, volatility: float) -> None:
+    def save_moves(self, game_id: int, moves: list[MoveRecord]) -> None:
+        pass
+
+    def save_benchmark(
+        self,
+        game_id: int,
+        rating: float,
+        rd: float,
+        volatility: float,
+        agent_name: str | None = None,
+    ) -> None:
         pass
 
     def get_last_benchmark(self, agent_name: str) -> tuple[float, float, float] | None:
@@ -244,3 +260,57 @@ def test_get_puzzle_not_found(client: TestClient) -> None:
     """
     response = client.get("/api/puzzles/unknown")
     assert response.status_code == 404
+
+
+def test_repository_is_shared_across_requests(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that the repository dependency is built once per process.
+
+    Why:
+        Building a repository per request reloads the JSON file and reopens the
+        SQLite connections, so their per-thread readers were never reused.
+    """
+    monkeypatch.setenv("CHESS_REPO_TYPE", "sqlite")
+    monkeypatch.setenv("CHESS_DB_PATH", str(tmp_path / "storage.db"))
+    close_repository()
+
+    repository = get_repository()
+    assert isinstance(repository, SQLiteRepository)
+    assert get_repository() is repository
+
+    close_repository()
+    with pytest.raises(sqlite3.ProgrammingError):
+        repository.conn.execute("SELECT 1")
+    assert get_repository() is not repository
+    close_repository()
+
+
+def test_repository_is_built_once_under_concurrent_requests(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test that concurrent first requests share a single repository.
+
+    Why:
+        FastAPI runs the sync dependency in its threadpool. Without the lock, requests
+        arriving together on a cold start each built a repository and leaked the extras.
+    """
+    built: list[MockRepository] = []
+
+    def slow_create() -> MockRepository:
+        time.sleep(0.05)  # Widen the race window
+        repository = MockRepository()
+        built.append(repository)
+        return repository
+
+    monkeypatch.setattr(dependencies, "_create_repository", slow_create)
+    close_repository()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: get_repository(), range(8)))
+
+    assert len(built) == 1
+    assert all(r is built[0] for r in results)
+    close_repository()
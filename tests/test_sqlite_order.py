@@ -17,7 +17,7 @@ def test_group_concat_order(memory_db: SQLiteRepository) -> None:
 
     Why:
         SQLite's group_concat does not guarantee order by default.
-        We rely on specific subquery ordering (SELECT * FROM move ORDER BY id)
+        We rely on specific subquery ordering (LEGAL_MOVES_IN_ORDER, sorted by move id)
         to ensure chess moves are reconstructed in the correct sequence.
         This test prevents regression of this critical logic.
     """
@@ -0,0 +1,41 @@
+import logging
+import time
+from collections.abc import Iterator
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+import pytest
+
+from chess_llm_eval.utils.logging import setup_logging
+
+
+@pytest.fixture
+def root_logger(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[logging.Logger]:
+    # setup_logging configures the process-wide root logger; restore it afterwards
+    monkeypatch.chdir(tmp_path)
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_setup_logging_writes_through_a_queue(root_logger: logging.Logger, tmp_path: Path) -> None:
+    """
+    Test that log records reach the log file through a background queue listener.
+    Why: Providers and the evaluator log on the asyncio event loop. Only a queue handler
+    may sit on the root logger, so no file or console write blocks the loop, and every
+    formatted record must still end up in the run's log file.
+    """
+    # pytest attaches its capture handler for the test call; start from a bare root
+    root_logger.handlers.clear()
+    logger = setup_logging()
+    logger.info("hello %s", "queue")
+
+    assert [type(handler) for handler in root_logger.handlers] == [QueueHandler]
+
+    log_file = next((tmp_path / "logs").glob("chess_eval_*.log"))
+    deadline = time.monotonic() + 5
+    while "hello queue" not in log_file.read_text() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert " - chess_llm_eval - INFO - hello queue" in log_file.read_text()
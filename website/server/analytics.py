@@ -15,7 +15,7 @@ def build_analytics_response(repository: GameRepository) -> AnalyticsResponse:
         max_points_per_agent = 500
 
         downsampled_parts = []
-        for _, group in bench_df.groupby("agent_name"):
+        for _, group in bench_df.groupby("agent_name", observed=True):
             n = len(group)
             if n > max_points_per_agent:
                 step = n // max_points_per_agent
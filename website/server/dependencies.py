@@ -1,15 +1,24 @@
 import os
-from collections.abc import Generator
+import threading
 from pathlib import Path
 
 from chess_llm_eval.data.json_repo import JSONRepository
 from chess_llm_eval.data.protocols import GameRepository
 from chess_llm_eval.data.sqlite import SQLiteRepository
 
+# Shared by every request; FastAPI resolves sync dependencies in its threadpool, so
+# creation and teardown happen under the lock to build exactly one repository
+_repository: GameRepository | None = None
+_repository_lock = threading.Lock()
 
-def get_repository() -> Generator[GameRepository, None, None]:
+
+def get_repository() -> GameRepository:
     """
-    Dependency to provide a GameRepository instance.
+    Dependency to provide the process-wide GameRepository instance.
+
+    The repository is built on first use and shared by every request, so the JSON
+    file is loaded once and SQLite readers are reused instead of reopened per request.
+    ``close_repository()`` releases it on shutdown.
 
     Supports two modes:
     1. **SQLite mode** (default for development): Uses SQLite database
@@ -23,6 +32,17 @@ def get_repository() -> Generator[GameRepository, None, None]:
 
     For Vercel deployment, set CHESS_REPO_TYPE=json and include data.json in the bundle.
     """
+    global _repository
+    repository = _repository
+    if repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = _create_repository()
+            repository = _repository
+    return repository
+
+
+def _create_repository() -> GameRepository:
     repo_type = os.getenv("CHESS_REPO_TYPE", "sqlite").lower()
 
     if repo_type == "json":
@@ -43,12 +63,7 @@ def get_repository() -> Generator[GameRepository, None, None]:
         else:
             json_path_full = Path(json_path)
 
-        repository: GameRepository = JSONRepository(str(json_path_full))
-        try:
-            yield repository
-        finally:
-            # JSONRepository doesn't need explicit cleanup
-            pass
+        return JSONRepository(str(json_path_full))
 
     else:
         # SQLite mode - for local development
@@ -64,8 +79,13 @@ def get_repository() -> Generator[GameRepository, None, None]:
             # Development mode: use env var or default relative path
             db_path = Path(os.getenv("CHESS_DB_PATH", "data/storage.db"))
 
-        repository = SQLiteRepository(db_path=str(db_path), immutable=immutable)
-        try:
-            yield repository
-        finally:
-            repository.conn.close()
+        return SQLiteRepository(db_path=str(db_path), immutable=immutable)
+
+
+def close_repository() -> None:
+    """Close the shared repository, if one was built, so the next request builds a new one."""
+    global _repository
+    with _repository_lock:
+        repository, _repository = _repository, None
+    if isinstance(repository, SQLiteRepository):
+        repository.close()
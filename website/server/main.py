@@ -1,4 +1,6 @@
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated, Any, cast
 from urllib.parse import unquote
 
@@ -17,9 +19,16 @@ from chess_llm_eval.schemas import (
     PuzzleResponse,
 )
 from website.server.analytics import build_analytics_response
-from website.server.dependencies import get_repository
+from website.server.dependencies import close_repository, get_repository
 
-app = FastAPI(title="Chess-LLM Arena API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    close_repository()
+
+
+app = FastAPI(title="Chess-LLM Arena API", lifespan=lifespan)
 
 # Simple in-memory cache for analytics (5 minutes TTL)
 _ANALYTICS_CACHE: dict[str, Any] = {"data": None, "expiry": 0.0}